@@ -0,0 +1,413 @@
+"""Read-only JSON API over the article store, for clients that aren't the Streamlit app.
+
+    python api.py [--host 127.0.0.1] [--port 8503] [--weather-api-key KEY]
+
+    GET /api/articles?category=&source=&city=&page=1&per_page=20
+    GET /api/trending
+    GET /api/weather?city=Hyderabad
+    GET /health
+    GET /metrics     Prometheus text (see metrics.py)
+
+The worker fetches, enriches, translates and categorizes the articles;
+this server only reads them. It holds no session per client. Each distinct
+response is built once per version of the data it shows (articles or
+trends, see ArticleStore.version) and kept in a shared LRU. Its
+gzip and brotli encodings are cached with it, and it carries a strong
+ETag, so a client that sends If-None-Match gets a 304 with no body. The
+store versions are checked at most every API_VERSION_CHECK_SECONDS, so most
+requests never touch SQLite. Weather comes from the same `WeatherService`
+the app uses. With TRANSLATION_SERVER_URL set, titles the worker couldn't
+translate are sent to the shared translation server as pages are built.
+Brotli needs the optional `brotli` package; without it only gzip is used.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import metrics
+from article_store import ArticleStore
+from config import (
+    API_CACHE_ENTRIES,
+    API_COMPRESS_MIN_BYTES,
+    API_HOST,
+    API_MAX_AGE,
+    API_MAX_PAGE_SIZE,
+    API_PAGE_SIZE,
+    API_PORT,
+    API_VERSION_CHECK_SECONDS,
+    ARTICLE_STORE_PATH,
+    RSS_FEEDS,
+    TELUGU_CATEGORIES,
+    TRANSLATION_BATCH_SIZE,
+    TRANSLATION_SERVER_URL,
+    WEATHER_POPULAR_CITIES,
+)
+from gazetteer import resolve as resolve_place, search_terms
+
+try:
+    import brotli
+except ImportError: # Optional: responses are gzip-only without it
+    brotli = None
+
+logger = logging.getLogger("bharatpulse.api")
+
+# Content codings we can produce, most preferred first
+ENCODERS = {"gzip": lambda body: gzip.compress(body, compresslevel=9)}
+if brotli is not None:
+    ENCODERS = {"br": lambda body: brotli.compress(body, quality=9), **ENCODERS}
+
+CATEGORY_NAMES = {name.casefold(): name for name in TELUGU_CATEGORIES.values()}
+CATEGORY_NAMES.update({label.casefold(): name for label, name in TELUGU_CATEGORIES.items()})
+SOURCE_NAMES = {name.casefold(): name for name in RSS_FEEDS}
+
+
+class BadRequest(Exception):
+    """A query parameter is missing or invalid (answered with a 400)."""
+
+
+class Unavailable(Exception):
+    """The endpoint isn't configured in this process (answered with a 503)."""
+
+
+class UpstreamError(Exception):
+    """An external service failed (answered with a 502)."""
+
+
+class Representation:
+    """One response body with its strong ETag and lazily made compressed encodings."""
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def etag(self, encoding=None):
+        # Each encoding is a different byte sequence, so it gets its own strong validator
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def encoded(self, encoding):
+        """The body in `encoding` (compressed once, then reused by every request)."""
+        with self._lock:
+            if encoding not in self._encoded:
+                self._encoded[encoding] = ENCODERS[encoding](self.body)
+            return self._encoded[encoding]
+
+    def matches(self, if_none_match):
+        """Whether an If-None-Match header names this body in any encoding (weak comparison, per RFC 9110)."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            tag = tag[2:] if tag.startswith("W/") else tag
+            if tag.strip('"').split("-", 1)[0] == self.digest:
+                return True
+        return False
+
+
+def choose_encoding(accept_encoding, size):
+    """Best encoding we can produce that the client accepts (None for identity or small bodies)."""
+    if size < API_COMPRESS_MIN_BYTES or not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ENCODERS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class ResponseCache:
+    """Shared LRU of built responses, each tagged with the store version it was built from."""
+
+    def __init__(self, max_entries=API_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # key -> (store version, Representation), least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version, build):
+        """Returns the cached Representation for `key` at `version`, building it with `build()` if needed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.record_cache("api", hit=True)
+                return entry[1]
+            self.misses += 1
+        metrics.record_cache("api", hit=False)
+        representation = Representation(build())
+        with self._lock:
+            self._entries[key] = (version, representation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return representation
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def article_json(article):
+    """The public fields of a stored article."""
+    translated = article["translated_title"]
+    if translated == article["title"]:
+        translated = None
+    return {
+        "guid": article["guid"],
+        "source": article["source"],
+        "title": article["title"],
+        "translated_title": translated,
+        "summary": article["summary"],
+        "link": article["link"],
+        "published": article["published"],
+        "image_url": article["image_url"],
+        "category": article["category"],
+        "also_reported": article.get("alternates", []),
+    }
+
+
+def _param(query, name):
+    values = query.get(name)
+    return values[0].strip() if values and values[0].strip() else None
+
+
+def _int_param(query, name, default, low, high):
+    value = _param(query, name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise BadRequest(f"'{name}' must be an integer")
+    if not low <= number <= high:
+        raise BadRequest(f"'{name}' must be between {low} and {high}")
+    return number
+
+
+class FeedApi:
+    """Builds the API's responses from the article store (and weather service), through a ResponseCache."""
+
+    def __init__(self, store, weather=None, translator=None, cache=None,
+                 version_check_seconds=API_VERSION_CHECK_SECONDS):
+        self.store = store
+        self.weather = weather
+        self.translator = translator
+        self.cache = cache or ResponseCache()
+        self.version_check_seconds = version_check_seconds
+        self._versions = None
+        self._version_checked = 0.0
+        self._version_lock = threading.Lock()
+
+    def version(self, scope="articles"):
+        """The store's version of `scope` (see ArticleStore.version), re-read at most every `version_check_seconds`."""
+        now = time.monotonic()
+        with self._version_lock:
+            if self._versions is None or now - self._version_checked >= self.version_check_seconds:
+                self._versions = self.store.versions()
+                self._version_checked = now
+            return self._versions[scope]
+
+    def articles(self, query):
+        category = _param(query, "category")
+        if category is not None:
+            if category.casefold() not in CATEGORY_NAMES:
+                raise BadRequest(f"unknown category '{category}'")
+            category = CATEGORY_NAMES[category.casefold()]
+        source = _param(query, "source")
+        if source is not None:
+            if source.casefold() not in SOURCE_NAMES:
+                raise BadRequest(f"unknown source '{source}'")
+            source = SOURCE_NAMES[source.casefold()]
+        city = _param(query, "city")
+        if city is not None:
+            place = resolve_place(city)
+            city = place["name"] if place else city # "హైదరాబాద్" and "hyderabad" share one cache entry
+        page = _int_param(query, "page", 1, 1, 10000)
+        per_page = _int_param(query, "per_page", API_PAGE_SIZE, 1, API_MAX_PAGE_SIZE)
+
+        def build():
+            offset = (page - 1) * per_page
+            # One extra row tells whether there is a next page
+            if city:
+                rows = self.store.search(search_terms(city), limit=per_page + 1, offset=offset, category=category,
+                                         source=source)
+            else:
+                rows = self.store.load_articles(category=category, source=source, limit=per_page + 1, offset=offset)
+            rows, has_more = rows[:per_page], len(rows) > per_page
+            if self.translator is not None:
+                self.translator.submit(rows) # Untranslated titles are filled in by the shared translation server
+            return {
+                "articles": [article_json(a) for a in rows],
+                "page": page,
+                "per_page": per_page,
+                "next_page": page + 1 if has_more else None,
+                "filters": {"category": category, "source": source, "city": city},
+            }
+
+        key = ("articles", category, source, city, page, per_page)
+        return self.cache.get(key, self.version(), build)
+
+    def trending(self, query):
+        return self.cache.get(("trending",), self.version("trends"), lambda: {"trending": self.store.trending()})
+
+    def current_weather(self, query):
+        from weather import WeatherError
+
+        city = _param(query, "city")
+        if city is None:
+            raise BadRequest("'city' is required")
+        if self.weather is None:
+            raise Unavailable("weather is not configured (start with --weather-api-key)")
+        try:
+            info = self.weather.get(city) # Cached and coalesced by WeatherService, not by version
+        except WeatherError as e:
+            raise UpstreamError(str(e))
+        return Representation({"city": city, "weather": info})
+
+    def health(self, query):
+        return Representation({"status": "ok", "versions": self.store.versions(), "cache": self.cache.stats()})
+
+
+ROUTES = {
+    "/api/articles": FeedApi.articles,
+    "/api/trending": FeedApi.trending,
+    "/api/weather": FeedApi.current_weather,
+    "/health": FeedApi.health,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive: clients reuse one connection for many requests
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        url = urlparse(self.path)
+        if url.path == "/metrics":
+            body = metrics.render_prometheus().encode("utf-8")
+            return self._send(200, body if send_body else b"", "text/plain; version=0.0.4; charset=utf-8",
+                              {"Content-Length": str(len(body))})
+        route = ROUTES.get(url.path.rstrip("/") or "/")
+        if route is None:
+            return self._send_error(404, "not found", send_body)
+        try:
+            with metrics.timer("api_" + url.path.strip("/").split("/")[-1]):
+                representation = route(self.server.api, parse_qs(url.query))
+        except BadRequest as e:
+            return self._send_error(400, str(e), send_body)
+        except Unavailable as e:
+            return self._send_error(503, str(e), send_body)
+        except UpstreamError as e:
+            return self._send_error(502, str(e), send_body)
+        except Exception:
+            logger.exception("%s failed", self.path)
+            return self._send_error(500, "internal error", send_body)
+
+        encoding = choose_encoding(self.headers.get("Accept-Encoding"), len(representation.body))
+        headers = {
+            "ETag": representation.etag(encoding),
+            "Cache-Control": f"public, max-age={API_MAX_AGE}",
+            "Vary": "Accept-Encoding",
+        }
+        if representation.matches(self.headers.get("If-None-Match")):
+            return self._send(304, b"", None, headers) # Validators and caching headers only, no body headers
+        body = representation.encoded(encoding) if encoding else representation.body
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(body))
+        self._send(200, body if send_body else b"", "application/json; charset=utf-8", headers)
+
+    def _send_error(self, status, message, send_body=True):
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        self._send(status, body if send_body else b"", "application/json; charset=utf-8",
+                   {"Content-Length": str(len(body))})
+
+    def _send(self, status, body, content_type, headers):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if "Content-Length" not in headers and status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Thousands of requests per second would flood stderr
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256 # Bursts of new connections from many clients
+
+
+def make_server(api, host=API_HOST, port=API_PORT):
+    """Returns an HTTP server (not yet serving) that answers from `api` (a FeedApi)."""
+    server = _Server((host, port), _Handler)
+    server.api = api
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve BharatPulse articles as a read-only JSON API.")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--weather-api-key", default=os.environ.get("OPENWEATHERMAP_API_KEY"),
+                        help="OpenWeatherMap key for /api/weather (default: $OPENWEATHERMAP_API_KEY)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    store = ArticleStore(ARTICLE_STORE_PATH)
+    weather = translator = None
+    if args.weather_api_key:
+        from weather import WeatherService
+
+        weather = WeatherService(args.weather_api_key).start_prefetch(WEATHER_POPULAR_CITIES)
+        metrics.register_collector("weather", weather.stats)
+    if TRANSLATION_SERVER_URL:
+        # Only with the shared server: this process never loads a model of its own
+        from translation import BackgroundTranslator
+        from translation_server import TranslationClient
+
+        translator = BackgroundTranslator(batch_size=TRANSLATION_BATCH_SIZE, on_translated=store.update_translations,
+                                          remote=TranslationClient(TRANSLATION_SERVER_URL)).start()
+    api = FeedApi(store, weather=weather, translator=translator)
+    metrics.register_collector("api_cache", api.cache.stats)
+    server = make_server(api, args.host, args.port)
+    logger.info("BharatPulse API on http://%s:%d/api/articles", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
 import streamlit as st
+import html
+import time
+
+# Time-to-first-render is measured from the top of each script run
+RUN_STARTED = time.perf_counter()
 
 # --- CRITICAL: set_page_config MUST BE THE FIRST STREAMLIT COMMAND ---
 st.set_page_config(
@@ -9,156 +14,167 @@ st.set_page_config(
 )
 
 # --- Remaining Imports (after set_page_config) ---
-import feedparser
-import requests
-from bs4 import BeautifulSoup
-from newspaper import Article # Make sure newspaper3k and lxml_html_clean are installed
-import torch
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
-import time
-import geocoder
-import json
-
-# --- Configuration ---
-TELUGU_CATEGORIES = {
-    "జాతీయ వార్తలు": "National",
-    "రాష్ట్ర వార్తలు": "State",
-    "క్రైం": "Crime",
-    "రాజకీయాలు": "Politics",
-    "వ్యాపారం": "Business",
-    "క్రీడలు": "Sports",
-    "వినోదం": "Entertainment",
-    "ఉద్యోగాలు": "Jobs",
-    "వాతావరణం": "Weather",
-    "వైరల్": "Viral",
-}
+# Only light modules are imported here. requests (through http_client.py), maxminddb, torch and
+# transformers are imported inside the functions that need them, so the first page renders without
+# waiting on them. Keep it that way: a top-level http_client import in any module below undoes it.
+import metrics
+from article_store import ArticleStore
+from cards import card_image, card_view
+from config import (
+    APP_METRICS_PORT,
+    ARTICLE_STORE_PATH,
+    GEOIP_CACHE_SIZE,
+    GEOIP_DATABASE_PATH,
+    HEADLINES_PAGE_SIZE,
+    HEADLINES_PAGE_SIZE_OPTIONS,
+    METRICS_ADMIN_PANEL,
+    METRICS_HOST,
+    RSS_FEEDS,
+    TELUGU_CATEGORIES,
+    THUMBNAIL_CACHE_DIR,
+    THUMBNAIL_CACHE_MAX_BYTES,
+    TRANSLATION_BACKEND,
+    TRANSLATION_BATCH_SIZE,
+    TRANSLATION_CACHE_MEMORY_ENTRIES,
+    TRANSLATION_CACHE_PATH,
+    TRANSLATION_PRESET,
+    TRANSLATION_SERVER_URL,
+    TRANSLATION_THREADS,
+    WEATHER_POPULAR_CITIES,
+)
+from gazetteer import resolve as resolve_place, search_terms
+from geoip import GeoIPLocator, client_ip
+from thumbnails import ThumbnailCache
+from translation import BackgroundTranslator
+from translation_cache import TranslationCache
+from translation_server import TranslationClient
+from weather import WeatherError, WeatherService
 
-# --- RSS Feed URLs ---
-# These are examples. You might need to verify their current validity and content.
-# Some news sites do not offer comprehensive RSS feeds, and scraping might be needed.
-RSS_FEEDS = {
-    "Sakshi": "https://www.sakshi.com/tags/rss", # This appears to be a general RSS for Sakshi.
-    "Eenadu": "https://www.eenadu.net/telugu-news/rss", # This URL from search might be old/unofficial.
-    # Way2News does not appear to have a public RSS feed, requiring scraping if you want its content.
-    # For now, let's stick to sources that publicly offer RSS.
-    # You might consider other major Telugu news sources like ABN Andhra Jyothy, TV9 Telugu if they have RSS.
-}
+ALL_CATEGORIES_LABEL = "అన్నీ (All)"
 
 # --- OpenWeatherMap API Configuration (for Realtime Weather) ---
 # YOU MUST OBTAIN YOUR OWN API KEY FROM OpenWeatherMap.org and replace the placeholder below.
 # A free account gives you access to a key.
 OPENWEATHERMAP_API_KEY = "YOUR_OPENWEATHERMAP_API_KEY_HERE" # <--- IMPORTANT: REPLACE THIS WITH YOUR REAL KEY!
-OPENWEATHERMAP_API_URL = "http://api.openweathermap.org/data/2.5/weather"
+# The API URL, cache lifetimes and the districts kept warm are in config.py (WEATHER_*)
 
-# --- Hugging Face Model Loading (Cached for performance) ---
+# --- Article Store (filled by ingest_worker.py) ---
 @st.cache_resource
-def load_translation_model():
-    """Loads the IndicTrans2 English to Telugu translation model."""
-    MODEL_NAME = "ai4bharat/indictrans2-en-indic-dist-200M" # A distilled version (200M parameters)
+def get_article_store():
+    """Opens the shared article store once per process."""
+    return ArticleStore(ARTICLE_STORE_PATH)
+
+def store_version(scope="articles"):
+    """Changes whenever the worker, a refresh or a translation writes to that part of the store.
+
+    "articles" covers articles, translations and categories; "feeds" the ingestion status; "trends" the ranking.
+    """
+    return get_article_store().version(scope)
+
+# The views below are keyed by the version of the data they show instead of a TTL: they are built
+# once per change to it and shared by every session and rerun until the next one.
+@st.cache_data(max_entries=64)
+def headlines_view(category, limit, version):
+    """The Headlines page for one category: stored articles plus their card views, without thumbnails.
+
+    Thumbnails are looked up at render time (`card_image`) since they appear
+    in the background without the store changing.
+    """
+    articles = get_article_store().load_articles(category=category, limit=limit)
+    return {"articles": articles, "cards": [card_view(article) for article in articles]}
+
+@st.cache_data(max_entries=4)
+def load_feed_status(version):
+    """Per-feed ingestion status written by the worker."""
+    return get_article_store().feed_status()
+
+@st.cache_data(max_entries=4)
+def load_trending(version):
+    """Trending terms ranked by the worker's sliding-window tracker (trends.py)."""
+    return get_article_store().trending()
+
+@st.cache_data(max_entries=256)
+def search_local_news(query, version, limit=20):
+    """Looks up stored articles mentioning a city/district via the full-text index."""
+    return get_article_store().search(search_terms(query), limit=limit)
+
+def render_local_news(query):
+    """Shows ranked local news for a city/district, or an info message if there is none."""
+    place = resolve_place(query)
+    if place:
+        st.caption(f"{place['telugu']} ({place['name']}), {place['state']}")
+    results = search_local_news(query, store_version())
+    if not results:
+        st.info(f"'{query}' కు సంబంధించిన వార్తలు ఇంకా లేవు. (No news for '{query}' yet.)")
+        return
+    for article in results:
+        title = article['translated_title'] or article['title']
+        st.markdown(f"- [{title}]({article['link']}) — *{article['source']}*")
+
+def refresh_feed(source_name):
+    """Fetches one feed now and merges its new entries (by GUID or link) into the store.
+
+    Views built from the store follow its version, so nothing is cleared here;
+    new English titles are picked up by the background translator on the next render.
+    Runs take turns with the worker's through the store's ingest lease, so this
+    waits (up to INGEST_LEASE_WAIT seconds, then raises TimeoutError) while one is in progress.
+    """
+    from ingest_worker import ingest_once
+
+    return ingest_once(
+        get_article_store(),
+        thumbnails=get_thumbnail_cache(),
+        feeds={source_name: RSS_FEEDS[source_name]},
+    )
 
-    try:
-        # The 'trust_remote_code=True' is essential for this model.
-        # Ensure 'sentencepiece' is installed in your environment (pip install sentencepiece).
-        tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, trust_remote_code=True)
-        model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME, trust_remote_code=True)
-
-        # Move model to GPU if available
-        if torch.cuda.is_available():
-            model.to("cuda")
-            st.success("అనువాద మోడల్ విజయవంతంగా లోడ్ చేయబడింది (Translation model loaded successfully) (GPU).")
-        else:
-            st.success("అనువాద మోడల్ విజయవంతంగా లోడ్ చేయబడింది (Translation model loaded successfully) (CPU).")
-        return tokenizer, model
-    except Exception as e:
-        st.error(f"Error loading translation model: {e}")
-        st.warning("అనువాద ఫీచర్ నిలిపివేయబడుతుంది. దయచేసి 'transformers', 'torch' మరియు 'sentencepiece' సరిగ్గా ఇన్‌స్టాల్ చేయబడి ఉన్నాయని, మీకు తగినంత వనరులు ఉన్నాయని మరియు మోడల్‌ను డౌన్‌లోడ్ చేయడానికి స్థిరమైన ఇంటర్నెట్ కనెక్షన్ ఉందని నిర్ధారించుకోండి. (Translation feature will be disabled. Please ensure 'transformers', 'torch', and 'sentencepiece' are installed correctly, you have sufficient resources, and a stable internet connection to download the model.)")
-        st.caption("మీరు 'sentencepiece' గురించి లోపం చూసినట్లయితే, మీ టెర్మినల్‌లో `pip install sentencepiece`ని అమలు చేయండి. (If you see an error about 'sentencepiece', run `pip install sentencepiece` in your terminal.)")
-        st.caption("మీరు ప్రమాణీకరణ లోపాలను చూసినట్లయితే, మీరు మీ టెర్మినల్‌లో `huggingface-cli login`ని అమలు చేయాల్సి రావచ్చు. (If you see authentication errors, you might need to run `huggingface-cli login` in your terminal.)")
-        return None, None
-
-tokenizer_en_te, model_en_te = load_translation_model()
-
-def translate_en_to_te(text):
-    if tokenizer_en_te is None or model_en_te is None:
-        return "Translation service unavailable."
-    if not text or not text.strip(): # Handle empty or whitespace-only input
-        return ""
-    try:
-        # IndicTrans2 models typically expect language tags in the input for multi-lingual models.
-        # <2en> for 'to English', <2te> for 'to Telugu'
-        # For EN->TE, the input format for the 'dist' models is `<2te> English_Sentence`
-        input_text_with_tags = f"<2te> {text}" 
-        
-        inputs = tokenizer(input_text_with_tags, return_tensors="pt", padding=True, truncation=True)
-        
-        if torch.cuda.is_available():
-            inputs = {k: v.to("cuda") for k, v in inputs.items()}
-        
-        translated_tokens = model_en_te.generate(**inputs, max_new_tokens=128, num_beams=5, early_stopping=True)
-        translated_text = tokenizer_en_te.batch_decode(translated_tokens, skip_special_tokens=True)[0]
-        # Remove any lingering target language tags if present in output
-        return translated_text.replace("<2te>", "").strip()
-    except Exception as e:
-        st.error(f"Error during translation: {e}")
-        return "Translation failed."
-
-# --- RSS Feed Fetching and Parsing (Cached for performance) ---
-@st.cache_data(ttl=3600) # Cache for 1 hour to reduce API calls to news sites
-def get_news_from_rss(url):
-    try:
-        feed = feedparser.parse(url)
-        articles = []
-        for entry in feed.entries:
-            title = entry.title if hasattr(entry, 'title') else ""
-            link = entry.link if hasattr(entry, 'link') else "#"
-            summary = entry.summary if hasattr(entry, 'summary') and entry.summary.strip() else ""
-            published = entry.published if hasattr(entry, 'published') else "N/A"
-            image_url = None
-
-            # Attempt to find image from media_content (common in some RSS feeds)
-            if hasattr(entry, 'media_content') and entry.media_content:
-                for media in entry.media_content:
-                    # Check for actual image type
-                    if 'url' in media and media.get('type', '').startswith('image'):
-                        image_url = media['url']
-                        break
-            # Attempt to find image from description HTML (common in others)
-            elif hasattr(entry, 'description'):
-                soup = BeautifulSoup(entry.description, 'html.parser')
-                img_tag = soup.find('img')
-                if img_tag and 'src' in img_tag.attrs:
-                    image_url = img_tag['src']
-
-            # Fallback to newspaper3k for better image/summary extraction from the article link
-            # Only if link is valid and no image/summary found yet
-            if link and "http" in link and link != "#" and (not image_url or not summary):
-                try:
-                    article_parser = Article(link)
-                    article_parser.download()
-                    article_parser.parse()
-                    if not image_url and article_parser.top_image:
-                        image_url = article_parser.top_image
-                    if not summary and article_parser.text: # Use first part of article text if no summary from RSS
-                        summary = article_parser.text[:200] + "..." if len(article_parser.text) > 200 else article_parser.text
-
-                except Exception as e:
-                    # print(f"Newspaper3k failed for {link}: {e}") # Uncomment for debugging newspaper issues
-                    pass # Silently fail if newspaper3k can't extract
-
-            # Only add articles with a valid title and link
-            if title.strip() and link.strip() != "#":
-                articles.append({
-                    "title": title,
-                    "link": link,
-                    "summary": summary,
-                    "published": published,
-                    "image_url": image_url,
-                    "translated_title": None # Placeholder for translation
-                })
-        return articles
-    except Exception as e:
-        st.error(f"Error fetching news from {url}: {e}")
-        return []
+# --- Metrics Endpoint (Prometheus text at /metrics, see metrics.py) ---
+@st.cache_resource
+def start_metrics_endpoint():
+    """Starts this process's metrics server once (None if disabled or the port is taken)."""
+    if not APP_METRICS_PORT:
+        return None
+    return metrics.start_http_server(APP_METRICS_PORT, host=METRICS_HOST)
+
+start_metrics_endpoint()
+
+# --- Card Thumbnails ---
+@st.cache_resource
+def get_thumbnail_cache():
+    """Shared on-disk cache of downscaled card images (also filled by the worker)."""
+    thumbnail_cache = ThumbnailCache(THUMBNAIL_CACHE_DIR, max_bytes=THUMBNAIL_CACHE_MAX_BYTES)
+    metrics.register_collector("thumbnails", thumbnail_cache.stats)
+    return thumbnail_cache
+
+# --- Translation Model (loaded in the background) ---
+TRANSLATION_POLL_SECONDS = 2 # How often the page checks whether background translations are done
+
+@st.cache_resource
+def get_translator():
+    """Starts loading the translation model on a background thread and returns immediately.
+
+    Titles the worker couldn't translate are translated here off the render
+    path and written back to the article store.
+    """
+    cache = TranslationCache(TRANSLATION_CACHE_PATH, max_memory_entries=TRANSLATION_CACHE_MEMORY_ENTRIES)
+    metrics.register_collector("translation_cache", cache.stats)
+    return BackgroundTranslator(
+        cache=cache, batch_size=TRANSLATION_BATCH_SIZE, on_translated=get_article_store().update_translations,
+        backend=TRANSLATION_BACKEND, num_threads=TRANSLATION_THREADS, preset=TRANSLATION_PRESET,
+        # With a shared translation server this process never loads its own copy of the model
+        remote=TranslationClient(TRANSLATION_SERVER_URL) if TRANSLATION_SERVER_URL else None,
+    ).start()
+
+@st.fragment(run_every=TRANSLATION_POLL_SECONDS)
+def translation_progress(visible_guids):
+    """Shows that visible translations are on the way and reruns the page once they are stored."""
+    translator = get_translator()
+    pending = translator.pending(visible_guids)
+    if pending == 0:
+        st.rerun() # The stored translations bumped the store version, so the Headlines view is rebuilt once
+    if translator.ready:
+        st.caption(f"🔄 {pending} శీర్షికలు అనువదించబడుతున్నాయి... ({pending} titles being translated...)")
+    else:
+        st.caption("🔄 అనువాద మోడల్ లోడ్ అవుతోంది; అనువాదాలు త్వరలో కనిపిస్తాయి. (Translation model is loading; translations will appear shortly.)")
 
 # --- Voice Search (Placeholder - requires a separate library/API) ---
 def voice_search_widget():
@@ -173,65 +189,43 @@ def voice_search_widget():
         st.write("ట్రాన్స్క్రిప్షన్: ఇది వాయిస్ సెర్చ్ కోసం ఒక నకిలీ ట్రాన్స్క్రిప్షన్ (Transcription: This is a mock transcription for voice search)")
         # You would then use the transcribed text for actual search
 
-# --- Location Detection (Placeholder) ---
-@st.cache_data(ttl=3600) # Cache location for an hour
+# --- Location Detection (offline GeoIP, per visitor) ---
+DEFAULT_LOCATION = ("Hyderabad", "Telangana", "India")
+
+@st.cache_resource
+def get_geoip_locator():
+    """Opens the local GeoIP database once per process (memory-mapped; lookups never leave the machine)."""
+    locator = GeoIPLocator(GEOIP_DATABASE_PATH, cache_size=GEOIP_CACHE_SIZE)
+    metrics.register_collector("geoip", locator.stats)
+    return locator
+
 def get_user_location():
-    """Attempts to get user's public IP based location (city/district)."""
-    try:
-        g = geocoder.ip('me')
-        if g.ok:
-            city = g.city if g.city else "Hyderabad"
-            state = g.state if g.state else "Telangana"
-            country = g.country if g.country else "India"
-            return city, state, country
-        else:
-            return "Hyderabad", "Telangana", "India" # Default to Hyderabad if geocoder fails
-    except Exception as e:
-        st.warning(f"Could not detect location: {e}. Defaulting to Hyderabad.")
-        return "Hyderabad", "Telangana", "India"
+    """Returns the visitor's (city/district, state, country) from their IP, defaulting to Hyderabad."""
+    # Proxy headers are read only behind GEOIP_TRUSTED_PROXIES proxies; ip_address needs Streamlit >= 1.45
+    ip = client_ip(st.context.headers, getattr(st.context, "ip_address", None))
+    place = get_geoip_locator().locate(ip)
+    if not place:
+        return DEFAULT_LOCATION
+    return place["name"], place["state"], "India"
 
 # --- Weather Integration ---
-@st.cache_data(ttl=600) # Cache weather for 10 minutes
+@st.cache_resource
+def get_weather_service(api_key):
+    """One weather cache per process, shared by every session; popular districts are kept warm."""
+    service = WeatherService(api_key)
+    metrics.register_collector("weather", service.stats)
+    return service.start_prefetch(WEATHER_POPULAR_CITIES)
+
 def get_current_weather(city_name, api_key):
     # Check if API key is configured
     if not api_key or api_key == "YOUR_OPENWEATHERMAP_API_KEY_HERE":
         # Do not raise an error here, let the calling function display the warning.
         return None
-
-    params = {
-        'q': city_name,
-        'appid': api_key,
-        'units': 'metric', # For Celsius
-        'lang': 'te' # Try for Telugu, though not all weather APIs support all languages
-    }
     try:
-        response = requests.get(OPENWEATHERMAP_API_URL, params=params)
-        response.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
-        weather_data = response.json()
-
-        # Extract relevant info
-        main_weather = weather_data['weather'][0]['description'] if weather_data.get('weather') else "N/A"
-        temperature = weather_data['main']['temp']
-        feels_like = weather_data['main']['feels_like']
-        humidity = weather_data['main']['humidity']
-        wind_speed = weather_data['wind']['speed']
-
-        weather_info = {
-            "description": main_weather.capitalize(),
-            "temperature": temperature,
-            "feels_like": feels_like,
-            "humidity": humidity,
-            "wind_speed": wind_speed
-        }
-        return weather_info
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching weather for {city_name}: {e}. This might be due to an invalid city name or API key issues.")
-        return None
-    except json.JSONDecodeError:
-        st.error(f"Error decoding weather data for {city_name}. Invalid response from API.")
-        return None
-    except KeyError as e:
-        st.error(f"Missing key in weather data for {city_name}: {e}. API response might be incomplete or unexpected.")
+        # Usually served from memory; only a city nobody asked about recently waits on the API
+        return get_weather_service(api_key).get(city_name)
+    except WeatherError as e:
+        st.error(f"{e}. This might be due to an invalid city name or API key issues.")
         return None
 
 # --- Custom CSS for card-like appearance, horizontal scrolling (no background color) ---
@@ -370,73 +364,131 @@ if 'user_location' not in st.session_state:
 if 'account_creation_date' not in st.session_state:
     st.session_state.account_creation_date = "N/A" # Could set to current date on first run
 
+# Each interactive tab is a fragment: its widgets (category, paging, search, profile fields)
+# rerun only that tab, so typing in the profile never rebuilds the Headlines grid.
+
 # --- Tab 1: Headlines ---
-with main_tabs[0]:
+@st.fragment
+def headlines_tab():
+    """Category filter, paged card grid and background translation/thumbnail prefetch."""
+    fragment_started = time.perf_counter()
+    # A full run counts from the top of the script; a rerun of just this tab counts from here
+    full_run = st.session_state.get("headlines_run_started") != RUN_STARTED
+    st.session_state.headlines_run_started = RUN_STARTED
+
     st.header("ప్రధాన వార్తలు (Headlines)")
+    version = store_version()
+
+    # Trending strip: the worker updates the counts as articles arrive; here the ranking is only read
+    trending = load_trending(store_version("trends"))
+    if trending:
+        st.markdown("**🔥 ట్రెండింగ్ (Trending):** " + " · ".join(
+            f"`{term['term']}`" for term in trending
+        ), help="గత కొన్ని గంటల్లో ఎక్కువగా కనిపిస్తున్న పదాలు (Terms showing up more than usual in the last few hours)")
 
     # Category selection for filtering
     st.markdown("##### వార్తల విభాగాలు (News Categories)")
     # Using st.radio with horizontal option for category selection
     selected_category_tl = st.radio(
         "విభాగం ఎంచుకోండి (Select Category):",
-        options=list(TELUGU_CATEGORIES.keys()),
+        options=[ALL_CATEGORIES_LABEL] + list(TELUGU_CATEGORIES.keys()),
         index=0,
         horizontal=True, # Makes radio buttons horizontal and scrollable
         key="headlines_category_select"
     )
-    # The actual category filtering logic would go here based on `selected_category_tl`
-    # For now, it's a placeholder.
+    # Articles are categorized by the worker at ingestion time, so filtering is a store index lookup
+    selected_category = TELUGU_CATEGORIES.get(selected_category_tl) # None for "All"
     st.markdown(f"**ఎంచుకున్న విభాగం:** {selected_category_tl}")
 
     st.markdown("---")
 
-    all_articles = []
-    with st.spinner("వార్తలను లోడ్ చేస్తోంది... (Loading news...)"):
-        for source_name, rss_url in RSS_FEEDS.items():
-            st.markdown(f"**{source_name} నుండి వార్తలు**")
-            articles = get_news_from_rss(rss_url)
-            
-            for article in articles:
-                # Simple heuristic to determine if translation is needed: check for ASCII alpha chars
-                # This prevents trying to translate already Telugu titles or titles with mixed scripts
-                if any(char.isalpha() and char.isascii() for char in article['title']):
-                    article['translated_title'] = translate_en_to_te(article['title'])
-                else:
-                    article['translated_title'] = article['title'] # Assume it's already Telugu or mixed
-
-            all_articles.extend(articles)
-        
-        if not all_articles:
-            st.warning("వార్తలు లోడ్ చేయబడలేదు. దయచేసి మీ RSS ఫీడ్ URLలను తనిఖి చేయండి లేదా ఇంటర్నెట్ కనెక్షన్\u200cని తనిఖి చేయండి. (No news loaded. Please check your RSS feed URLs or internet connection.)")
+    # Paging: only the visible cards are rendered and translated, plus a background prefetch of the next page
+    page_size = st.selectbox(
+        "ఒక్కో పేజీకి వార్తలు (Cards per page):",
+        options=HEADLINES_PAGE_SIZE_OPTIONS,
+        index=HEADLINES_PAGE_SIZE_OPTIONS.index(HEADLINES_PAGE_SIZE),
+        key="headlines_page_size"
+    )
+    pages_key = f"headlines_pages_{selected_category or 'all'}"
+    if pages_key not in st.session_state:
+        st.session_state[pages_key] = 1
+    visible_count = st.session_state[pages_key] * page_size
+
+    # Articles are fetched, enriched and translated by ingest_worker.py; here we only read stored rows.
+    # One extra page is read so it can be prefetched and so we know whether "load more" applies.
+    view = headlines_view(selected_category, visible_count + page_size, version)
+    feed_status = load_feed_status(store_version("feeds"))
+    all_articles = view["articles"]
+    visible_articles = all_articles[:visible_count]
+    visible_cards = view["cards"][:visible_count]
+    next_page_articles = all_articles[visible_count:]
+    # Cards from every source are paged together, so only feeds whose last poll failed are called out
+    for source_name, rss_url in RSS_FEEDS.items():
+        status = feed_status.get(source_name)
+        if status and status["last_error"]:
+            st.error(f"{source_name} నుండి వార్తలు అందలేదు (Error fetching news from {rss_url}): {status['last_error']}")
+
+    if not all_articles and selected_category:
+        st.info(f"'{selected_category_tl}' విభాగంలో వార్తలు లేవు. (No news in this category yet.)")
+    elif not all_articles:
+        st.warning("వార్తలు లోడ్ చేయబడలేదు. దయచేసి మీ RSS ఫీడ్ URLలను తనిఖి చేయండి లేదా ఇంటర్నెట్ కనెక్షన్\u200cని తనిఖి చేయండి. (No news loaded. Please check your RSS feed URLs or internet connection.)")
+        st.info("వార్తల సేకరణ సేవను ప్రారంభించండి: `python ingest_worker.py` (Start the ingestion worker: `python ingest_worker.py`)")
+
+    # Untranslated titles are shown as-is and translated in the background
+    translator = get_translator()
+    translator.submit(visible_articles)
+    translator.submit(next_page_articles) # Prefetch: queued behind the visible page
+    visible_guids = tuple(a['guid'] for a in visible_articles)
+    if translator.pending(visible_guids):
+        translation_progress(visible_guids)
+
+    # Card images come from the thumbnail cache; missing ones are made in the background
+    thumbnail_cache = get_thumbnail_cache()
+    thumbnail_cache.prefetch(a['image_url'] for a in visible_articles + next_page_articles)
 
     # Display news in a grid (swipe-style mock-up)
-    if all_articles:
+    if visible_cards:
         num_cols = 3 # Number of columns for news cards
         rows = []
-        for i in range(0, len(all_articles), num_cols):
-            rows.append(all_articles[i:i + num_cols])
+        for i in range(0, len(visible_cards), num_cols):
+            rows.append(visible_cards[i:i + num_cols])
 
-        for row_articles in rows:
+        for row_cards in rows:
             cols = st.columns(num_cols)
-            for i, article in enumerate(row_articles):
+            for i, card in enumerate(row_cards):
                 with cols[i]:
+                    image = card_image(card['image'], thumbnail_cache)
                     with st.container(): # Using container for card effect
                         st.markdown(f'<div class="news-card">', unsafe_allow_html=True)
-                        if article['image_url']:
-                            st.image(article['image_url'], use_column_width="always", caption="")
-                        
+                        if image:
+                            st.image(image, use_column_width="always", caption="")
+
                         # Display translated title first, with expander for original if translated
-                        if article['translated_title'] and article['translated_title'] != article['title'] and article['translated_title'] != "Translation failed.":
-                            st.markdown(f"### {article['translated_title']}")
+                        st.markdown(f"### {card['title']}")
+                        if card['original_title']:
                             with st.expander("Original Title"):
-                                st.write(article['title'])
-                        else:
-                            st.markdown(f"### {article['title']}") # Display original if no translation or translation failed
-                        
-                        st.markdown(f"<p>{article['summary']}</p>", unsafe_allow_html=True) # Summary is already truncated in get_news_from_rss
-                        st.markdown(f"[పూర్తిగా చదవండి (Read More)]({article['link']})", unsafe_allow_html=True)
+                                st.write(card['original_title'])
+
+                        st.markdown(f"<p>{html.escape(card['summary'])}</p>", unsafe_allow_html=True) # Summaries are stored as plain text
+                        st.markdown(f"[పూర్తిగా చదవండి (Read More)]({card['link']})", unsafe_allow_html=True)
+                        if card['also_reported']:
+                            st.caption(f"ఇతర మూలాలు (Also reported by): {card['also_reported']}")
                         st.markdown('</div>', unsafe_allow_html=True)
 
+        if next_page_articles:
+            if st.button("మరిన్ని వార్తలు (Load More)", key="headlines_load_more"):
+                st.session_state[pages_key] += 1
+                st.rerun(scope="fragment")
+
+    # Time-to-first-render: the Headlines tab is what users see first
+    render_seconds = time.perf_counter() - (RUN_STARTED if full_run else fragment_started)
+    metrics.observe("render_headlines", render_seconds)
+    st.session_state.last_render_seconds = render_seconds
+    if 'first_render_seconds' not in st.session_state:
+        st.session_state.first_render_seconds = render_seconds
+
+with main_tabs[0]:
+    headlines_tab()
 
 # --- Tab 2: My Location ---
 with main_tabs[1]:
@@ -460,8 +512,7 @@ with main_tabs[1]:
             st.info(f"'{user_city}' కోసం వాతావరణ డేటా అందుబాటులో లేదు. (Weather data not available for '{user_city}').")
 
     st.subheader("స్థానిక వార్తలు (Local News)")
-    # Placeholder for local news (e.g., fetch from specific local RSS or scrape, needs specific city-level data)
-    st.info(f"'{user_city}' కు సంబంధించిన స్థానిక వార్తలు ఇక్కడ ప్రదర్శించబడతాయి. (Local news for '{user_city}' will be displayed here.)")
+    render_local_news(user_city)
     
     # Placeholder for alerts (e.g., integrate with disaster management APIs or specific news sources)
     st.subheader("అలర్ట్స్ (Alerts)")
@@ -469,7 +520,9 @@ with main_tabs[1]:
 
 
 # --- Tab 3: Search City ---
-with main_tabs[2]:
+@st.fragment
+def search_city_tab():
+    """City/district search: weather and local news, on button press."""
     st.header("🔍 నగరాన్ని శోధించండి (Search City)")
 
     search_city = st.text_input("నగరం లేదా జిల్లా పేరును నమోదు చేయండి (Enter City or District Name):", "హైదరాబాద్", key="city_search_input")
@@ -492,8 +545,10 @@ with main_tabs[2]:
                 st.info(f"'{search_city}' కోసం వాతావరణ డేటా అందుబాటులో లేదు. (Weather data not available for '{search_city}').")
 
         st.subheader(f"స్థానిక వార్తలు: {search_city} (Local News: {search_city})")
-        st.warning("ఈ ఫీచర్ కోసం స్థానిక వార్తా వనరులను అనుసంధానించడం అవసరం. (This feature requires integration with local news sources.)")
-        st.info(f"'{search_city}' కు సంబంధించిన వార్తలు ఇక్కడ ప్రదర్శించబడతాయి. (News for '{search_city}' will be displayed here.)")
+        render_local_news(search_city)
+
+with main_tabs[2]:
+    search_city_tab()
 
 
 # --- Tab 4: Voice Search ---
@@ -501,7 +556,9 @@ with main_tabs[3]:
     voice_search_widget()
 
 # --- Tab 5: User Profile (New Tab) ---
-with main_tabs[4]:
+@st.fragment
+def profile_tab():
+    """Personal details and preferences, kept in session state."""
     st.header("👤 యూజర్ ప్రొఫైల్ (User Profile)")
     st.markdown("మీ ప్రొఫైల్ వివరాలు మరియు యాప్ వినియోగ విశ్లేషణలు (Your profile details and app usage analytics)")
 
@@ -574,14 +631,88 @@ with main_tabs[4]:
 
     st.info("ఈ ప్రాధాన్యతలు భవిష్యత్తులో మీ వార్తల ఫీడ్‌ను వ్యక్తిగతీకరించడానికి ఉపయోగించబడతాయి. (These preferences will be used to personalize your news feed in the future.)")
 
+with main_tabs[4]:
+    profile_tab()
+
 st.sidebar.title("భారత్ పల్స్ - సెట్టింగ్‌లు")
 st.sidebar.info("ఇక్కడ మీరు యాప్ సెట్టింగ్‌లను కాన్ఫిగర్ చేయవచ్చు. (Here you can configure app settings.)")
 
+# Per-feed refresh: re-pulls one source and merges only its new entries into the store.
+# The translation model, weather, location and other cached resources are left alone.
+refresh_source = st.sidebar.selectbox("వార్తా మూలం (News Source):", options=list(RSS_FEEDS.keys()), key="refresh_source_select")
 if st.sidebar.button("రీఫ్రెష్ వార్తలు", key="refresh_news_button"):
-    st.cache_data.clear() # Clear all data caches (news, location, weather)
-    st.cache_resource.clear() # Clear model cache (translation model)
-    st.rerun() # Rerun the app to load fresh data
-    st.sidebar.success("వార్తలు రీఫ్రెష్ చేయబడ్డాయి!")
+    with st.sidebar:
+        with st.spinner(f"{refresh_source} రీఫ్రెష్ అవుతోంది... (Refreshing {refresh_source}...)"):
+            try:
+                st.session_state.last_refresh = (refresh_source, refresh_feed(refresh_source))
+            except TimeoutError: # The worker's run held the ingest lease for too long
+                st.session_state.last_refresh = (refresh_source, None)
+    st.rerun() # Rerun the app to show the merged entries
+
+if 'last_refresh' in st.session_state:
+    refreshed_source, new_count = st.session_state.pop('last_refresh')
+    if new_count is None:
+        st.sidebar.warning(f"{refreshed_source}: వార్తల సేకరణ ఇప్పటికే జరుగుతోంది, కాసేపట్లో మళ్లీ ప్రయత్నించండి."
+                           " (Ingestion is already running; try again shortly.)")
+    else:
+        st.sidebar.success(f"వార్తలు రీఫ్రెష్ చేయబడ్డాయి! {refreshed_source}: {new_count} కొత్త వార్తలు ({new_count} new articles)")
+
+with st.sidebar.expander("వార్తల సేకరణ స్థితి (Ingestion Status)"):
+    feed_status = load_feed_status(store_version("feeds"))
+    if feed_status:
+        st.table([
+            {
+                "source": source,
+                "last success": time.strftime("%Y-%m-%d %H:%M", time.localtime(status["last_success"])) if status["last_success"] else "never",
+                "new articles": status["new_articles"],
+                # Polling schedule kept by the worker's scheduler (scheduler.py)
+                "every": f"{status['poll_interval'] / 60:.0f} min" if status["poll_interval"] else "",
+                "next poll": time.strftime("%H:%M", time.localtime(status["next_poll"])) if status["next_poll"] else "",
+                "failures in a row": status["consecutive_failures"] or 0,
+                "error": status["last_error"] or "",
+            }
+            for source, status in feed_status.items()
+        ])
+    else:
+        st.write("The ingestion worker has not run yet.")
+
+with st.sidebar.expander("పనితీరు (Performance)"):
+    st.write(f"Time to first render: {st.session_state.first_render_seconds * 1000:.0f} ms (this session), {st.session_state.last_render_seconds * 1000:.0f} ms (last render)")
+    startup_translator = get_translator()
+    if not startup_translator.ready:
+        st.write("Translation model: loading in the background...")
+    elif startup_translator.available and TRANSLATION_SERVER_URL:
+        st.write(f"Translation model: shared server at {TRANSLATION_SERVER_URL}")
+    elif startup_translator.available:
+        st.write(f"Translation model: ready (loaded and warmed up in {startup_translator.load_seconds:.1f}s;"
+                 f" {TRANSLATION_BACKEND} backend, {TRANSLATION_PRESET} preset)")
+    else:
+        st.write(f"Translation model: unavailable ({startup_translator.error})")
+
+if METRICS_ADMIN_PANEL:
+    with st.sidebar.expander("మెట్రిక్స్ (Metrics)"):
+        metrics_snapshot = metrics.snapshot()
+        st.table([
+            {
+                "stage": stage,
+                "count": values["count"],
+                "avg ms": round(values["total_seconds"] / values["count"] * 1000, 1) if values["count"] else 0,
+                "max ms": round(values["max_seconds"] * 1000, 1),
+                "errors": values["errors"],
+            }
+            for stage, values in sorted(metrics_snapshot["stages"].items())
+        ])
+        cache_names = sorted({cache for cache, _ in metrics_snapshot["caches"]})
+        st.table([
+            {
+                "cache": cache,
+                "hits": metrics_snapshot["caches"].get((cache, "hit"), 0),
+                "misses": metrics_snapshot["caches"].get((cache, "miss"), 0),
+            }
+            for cache in cache_names
+        ])
+        if APP_METRICS_PORT:
+            st.caption(f"Prometheus: http://{METRICS_HOST}:{APP_METRICS_PORT}/metrics")
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("© 2025 భారత్ పల్స్")
@@ -0,0 +1,414 @@
+"""Shared local article store.
+
+ingest_worker.py writes enriched and translated articles here; app.py only
+reads them. SQLite in WAL mode lets the two processes work on it at once.
+A full-text index over original titles, translated titles and summaries is
+kept up to date as rows are inserted, so searches never rebuild it.
+The worker's trending-terms tracker (trends.py) is saved here too.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from gazetteer import normalize
+
+ARTICLE_COLUMNS = ("guid", "source", "title", "link", "summary", "published", "image_url", "translated_title",
+                   "category")
+# bm25 weights for the title, translated_title and summary columns of the search index
+SEARCH_WEIGHTS = (10.0, 8.0, 1.0)
+
+
+def _to_signed(fingerprint):
+    # SQLite integers are signed 64-bit; SimHash fingerprints are unsigned
+    if fingerprint is None:
+        return None
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def _from_signed(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+class ArticleStore:
+    """SQLite-backed table of articles keyed by feed GUID (or link), plus per-feed status."""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                guid TEXT NOT NULL UNIQUE,
+                source TEXT NOT NULL,
+                title TEXT NOT NULL,
+                link TEXT NOT NULL,
+                summary TEXT,
+                published TEXT,
+                image_url TEXT,
+                translated_title TEXT,
+                first_seen REAL NOT NULL,
+                position INTEGER NOT NULL,
+                fingerprint INTEGER,
+                cluster_guid TEXT,
+                category TEXT
+            );
+            CREATE INDEX IF NOT EXISTS articles_recent ON articles (first_seen DESC, position);
+            CREATE INDEX IF NOT EXISTS articles_link ON articles (link);
+            CREATE TABLE IF NOT EXISTS feed_status (
+                source TEXT PRIMARY KEY,
+                last_attempt REAL,
+                last_success REAL,
+                last_error TEXT,
+                new_articles INTEGER,
+                poll_interval REAL,
+                next_poll REAL,
+                cadence_seconds REAL,
+                consecutive_failures INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS store_versions (
+                scope TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO store_versions (scope, version) VALUES ('articles', 0), ('feeds', 0), ('trends', 0);
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS trends (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                state BLOB NOT NULL,
+                trending TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+        self._add_missing_columns()
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_cluster ON articles (cluster_guid)")
+        # Per-category index: switching the Headlines category is an index range scan
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS articles_category ON articles (category, first_seen DESC, position)"
+        )
+        self._create_search_index()
+        self._clear_failed_translations()
+        self._conn.commit()
+
+    def _clear_failed_translations(self):
+        # Older versions stored a placeholder for failed translations, which kept them from being retried
+        self._conn.execute("UPDATE articles SET translated_title = NULL WHERE translated_title = 'Translation failed.'")
+        self._conn.execute("UPDATE articles_fts SET translated_title = '' WHERE translated_title = 'translation failed.'")
+
+    def _add_missing_columns(self):
+        # Stores created by older versions lack the clustering and category columns
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(articles)")}
+        for column, column_type in (("fingerprint", "INTEGER"), ("cluster_guid", "TEXT"), ("category", "TEXT")):
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE articles ADD COLUMN {column} {column_type}")
+        # ... and their feed status lacks the polling schedule
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(feed_status)")}
+        for column, column_type in (("poll_interval", "REAL"), ("next_poll", "REAL"), ("cadence_seconds", "REAL"),
+                                    ("consecutive_failures", "INTEGER")):
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE feed_status ADD COLUMN {column} {column_type}")
+
+    def _create_search_index(self):
+        # The trigram tokenizer matches substrings, so inflected Telugu forms like
+        # "హైదరాబాదులో" are found by the stem "హైదరాబాద"; older SQLite builds fall back to unicode61.
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'"
+        ).fetchone()
+        if exists:
+            return
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE articles_fts USING fts5(title, translated_title, summary, tokenize='trigram')"
+            )
+        except sqlite3.OperationalError:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE articles_fts USING fts5(title, translated_title, summary)"
+            )
+        # One-off backfill for stores created before the index existed
+        rows = self._conn.execute("SELECT id, title, translated_title, summary FROM articles").fetchall()
+        self._conn.executemany(
+            "INSERT INTO articles_fts (rowid, title, translated_title, summary) VALUES (?, ?, ?, ?)",
+            [(row["id"], normalize(row["title"]), normalize(row["translated_title"]), normalize(row["summary"]))
+             for row in rows],
+        )
+
+    def _bump_version(self, scope):
+        # Caller holds the lock and commits; runs in the same transaction as the change
+        self._conn.execute("UPDATE store_versions SET version = version + 1 WHERE scope = ?", (scope,))
+
+    def version(self, scope="articles"):
+        """A number that changes whenever the data in `scope` changes (from any process).
+
+        Scopes are "articles" (articles, translations and categories), "feeds"
+        (ingestion status and schedules) and "trends", so a poll that only
+        updates feed status doesn't invalidate article views. Views built from
+        the store can be cached under the version of what they show instead of a TTL.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT version FROM store_versions WHERE scope = ?", (scope,)).fetchone()[0]
+
+    def versions(self):
+        """`{scope: version}` for every scope, in one query."""
+        with self._lock:
+            rows = self._conn.execute("SELECT scope, version FROM store_versions").fetchall()
+        return {row["scope"]: row["version"] for row in rows}
+
+    def known(self, articles):
+        """Returns the guids of `articles` that are already stored, matching by GUID or by link."""
+        known = set()
+        with self._lock:
+            for start in range(0, len(articles), 250):
+                chunk = articles[start:start + 250]
+                guids = [a["guid"] for a in chunk]
+                links = [a["link"] for a in chunk]
+                rows = self._conn.execute(
+                    f"SELECT guid, link FROM articles WHERE guid IN ({','.join('?' * len(guids))})"
+                    f" OR link IN ({','.join('?' * len(links))})",
+                    guids + links,
+                ).fetchall()
+                stored_guids = {row["guid"] for row in rows}
+                stored_links = {row["link"] for row in rows}
+                known.update(a["guid"] for a in chunk if a["guid"] in stored_guids or a["link"] in stored_links)
+        return known
+
+    def add_articles(self, source, articles, first_seen=None):
+        """Inserts articles that aren't stored yet, keeping feed order. Returns how many were new."""
+        first_seen = time.time() if first_seen is None else first_seen
+        added = 0
+        with self._lock:
+            for position, a in enumerate(articles):
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO articles (guid, source, title, link, summary, published, image_url,"
+                    " translated_title, first_seen, position, fingerprint, cluster_guid, category)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (a["guid"], source, a["title"], a["link"], a["summary"], a["published"], a["image_url"],
+                     a["translated_title"], first_seen, position, _to_signed(a.get("fingerprint")),
+                     a.get("cluster_guid"), a.get("category")),
+                )
+                if cursor.rowcount:
+                    # Index the new row in the same transaction
+                    self._conn.execute(
+                        "INSERT INTO articles_fts (rowid, title, translated_title, summary) VALUES (?, ?, ?, ?)",
+                        (cursor.lastrowid, normalize(a["title"]), normalize(a["translated_title"]),
+                         normalize(a["summary"])),
+                    )
+                    added += 1
+            if added:
+                self._bump_version("articles")
+            self._conn.commit()
+        return added
+
+    def load_articles(self, category=None, limit=None, source=None, offset=0):
+        """Returns one article per story, newest ingestion run first and in feed order within a run.
+
+        `category` (an English TELUGU_CATEGORIES value) and `source` (an
+        RSS_FEEDS name) restrict the result; `offset` skips that many stories.
+        Near-duplicates from other sources are attached to their story as
+        `alternates`, a list of `{"source", "title", "link"}` dicts.
+        """
+        query = f"SELECT {', '.join(ARTICLE_COLUMNS)} FROM articles WHERE cluster_guid IS NULL"
+        params = []
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+        query += " ORDER BY first_seen DESC, position"
+        if limit or offset:
+            query += " LIMIT ? OFFSET ?"
+            params += [limit or -1, offset]
+        with self._lock:
+            articles = [dict(row) for row in self._conn.execute(query, params).fetchall()]
+            self._attach_alternates(articles)
+        return articles
+
+    def _attach_alternates(self, articles):
+        # Caller holds the lock
+        guids = [a["guid"] for a in articles]
+        alternates = []
+        for start in range(0, len(guids), 500):
+            chunk = guids[start:start + 500]
+            alternates.extend(self._conn.execute(
+                "SELECT cluster_guid, source, title, link FROM articles"
+                f" WHERE cluster_guid IN ({','.join('?' * len(chunk))}) ORDER BY first_seen, position",
+                chunk,
+            ).fetchall())
+        by_guid = {a["guid"]: a for a in articles}
+        for article in articles:
+            article["alternates"] = []
+        for row in alternates:
+            head = by_guid.get(row["cluster_guid"])
+            if head is not None:
+                head["alternates"].append({"source": row["source"], "title": row["title"], "link": row["link"]})
+        return articles
+
+    def update_translations(self, translations):
+        """Stores `{guid: translated_title}` for articles translated after they were ingested."""
+        with self._lock:
+            changed = 0
+            for guid, translated in translations.items():
+                row = self._conn.execute("SELECT id FROM articles WHERE guid = ?", (guid,)).fetchone()
+                if row is None:
+                    continue
+                cursor = self._conn.execute(
+                    "UPDATE articles SET translated_title = ? WHERE id = ? AND translated_title IS NOT ?",
+                    (translated, row["id"], translated),
+                )
+                if cursor.rowcount > 0:
+                    changed += 1
+                    self._conn.execute(
+                        "UPDATE articles_fts SET translated_title = ? WHERE rowid = ?",
+                        (normalize(translated), row["id"]),
+                    )
+            if changed:
+                self._bump_version("articles") # Cached views only rebuild when a title actually changed
+            self._conn.commit()
+
+    def uncategorized(self, limit=1000):
+        """Returns up to `limit` stored articles (guid, title, summary) that have no category yet."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT guid, title, summary FROM articles WHERE category IS NULL LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def set_categories(self, categories):
+        """Stores `{guid: category}`."""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE articles SET category = ? WHERE guid = ?",
+                [(category, guid) for guid, category in categories.items()],
+            )
+            self._bump_version("articles")
+            self._conn.commit()
+
+    def recent_fingerprints(self, limit, since=0):
+        """Returns `(guid, fingerprint, source, first_seen)` for the newest `limit` story heads first seen
+        after `since`, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT guid, fingerprint, source, first_seen FROM articles"
+                " WHERE cluster_guid IS NULL AND fingerprint IS NOT NULL AND first_seen > ?"
+                " ORDER BY id DESC LIMIT ?", (since, limit)
+            ).fetchall()
+        return [(row["guid"], _from_signed(row["fingerprint"]), row["source"], row["first_seen"])
+                for row in reversed(rows)]
+
+    def search(self, terms, limit=20, offset=0, category=None, source=None):
+        """Returns articles matching any of `terms` (see `gazetteer.search_terms`), best match first.
+
+        `category`, `source` and `offset` work as in `load_articles`.
+        """
+        phrases = ['"' + term.replace('"', '""') + '"' for term in terms if term]
+        if not phrases:
+            return []
+        columns = ", ".join(f"a.{c}" for c in ARTICLE_COLUMNS)
+        query = (
+            f"SELECT {columns} FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid"
+            f" WHERE articles_fts MATCH ? AND a.cluster_guid IS NULL"
+        )
+        params = [" OR ".join(phrases)]
+        if category:
+            query += " AND a.category = ?"
+            params.append(category)
+        if source:
+            query += " AND a.source = ?"
+            params.append(source)
+        query += " ORDER BY bm25(articles_fts, ?, ?, ?), a.first_seen DESC LIMIT ? OFFSET ?"
+        params += [*SEARCH_WEIGHTS, limit, offset]
+        with self._lock:
+            articles = [dict(row) for row in self._conn.execute(query, params).fetchall()]
+            self._attach_alternates(articles)
+        return articles
+
+    def record_feed_status(self, source, error=None, new_articles=0):
+        """Remembers the outcome of the latest fetch of `source`."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO feed_status (source, last_attempt, last_success, last_error, new_articles)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(source) DO UPDATE SET last_attempt = excluded.last_attempt,"
+                " last_success = COALESCE(excluded.last_success, feed_status.last_success),"
+                " last_error = excluded.last_error, new_articles = excluded.new_articles",
+                (source, now, None if error else now, error, new_articles),
+            )
+            self._bump_version("feeds")
+            self._conn.commit()
+
+    def record_feed_schedule(self, source, schedule):
+        """Saves a feed's polling schedule (`FeedScheduler.status`) next to its status."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO feed_status (source, poll_interval, next_poll, cadence_seconds, consecutive_failures)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(source) DO UPDATE SET poll_interval = excluded.poll_interval,"
+                " next_poll = excluded.next_poll, cadence_seconds = excluded.cadence_seconds,"
+                " consecutive_failures = excluded.consecutive_failures",
+                (source, schedule["poll_interval"], schedule["next_poll"], schedule["cadence_seconds"],
+                 schedule["consecutive_failures"]),
+            )
+            self._bump_version("feeds")
+            self._conn.commit()
+
+    def feed_status(self):
+        """Returns `{source: status dict}` for every feed the worker has tried."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM feed_status").fetchall()
+        return {row["source"]: dict(row) for row in rows}
+
+    def save_trends(self, state, trending):
+        """Stores the serialized trend tracker and its current ranking (a list of dicts)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO trends (id, state, trending, updated_at) VALUES (1, ?, ?, ?)",
+                (state, json.dumps(trending, ensure_ascii=False), time.time()),
+            )
+            self._bump_version("trends")
+            self._conn.commit()
+
+    def acquire_lease(self, name, holder, seconds):
+        """Takes the named lease for `seconds` if it is free, expired or already `holder`'s. Returns whether it did.
+
+        Leases serialize work between processes sharing the store (the worker and the app's refresh).
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (name, holder, expires) VALUES (?, ?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET holder = excluded.holder, expires = excluded.expires"
+                " WHERE leases.expires < ? OR leases.holder = excluded.holder",
+                (name, holder, now + seconds, now),
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def release_lease(self, name, holder):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+            self._conn.commit()
+
+    def trend_state(self):
+        """The serialized trend tracker saved by `save_trends`, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM trends WHERE id = 1").fetchone()
+        return row["state"] if row else None
+
+    def trending(self):
+        """The ranking saved with the trend tracker (empty before the first ingestion run)."""
+        with self._lock:
+            row = self._conn.execute("SELECT trending FROM trends WHERE id = 1").fetchone()
+        return json.loads(row["trending"]) if row else []
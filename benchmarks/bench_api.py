@@ -0,0 +1,123 @@
+"""Load test for api.py: requests/s, latency and bytes per response for each kind of request.
+
+    python benchmarks/bench_api.py [--url http://127.0.0.1:8503] [--concurrency 1 8 32] [--requests 2000]
+
+Without --url, the recorded Sakshi/Eenadu fixtures (fixture_server.py) are
+ingested into a temporary store and an API server is started in this
+process. Each client thread keeps one connection open and requests:
+
+    uncached    a page/per_page not requested before, so every response is built
+                (most are past the last story and empty: compare latency, not bytes)
+    cached      the same page, uncompressed
+    gzip        the same page with Accept-Encoding: gzip (br too if brotli is installed)
+    revalidate  the same page with If-None-Match, answered 304 with no body
+"""
+import argparse
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_pipeline import percentile
+from fixture_server import FixtureServer
+
+PAGE = "/api/articles?per_page=20"
+
+
+def request(connection, path, headers):
+    connection.request("GET", path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    return response, body
+
+
+def mode_request(mode, n, etag):
+    """Path and headers of request `n` in `mode`."""
+    if mode == "uncached":
+        return f"/api/articles?per_page={1 + n % 100}&page={1 + n // 100}", {}
+    if mode == "gzip":
+        return PAGE, {"Accept-Encoding": "br, gzip"}
+    if mode == "revalidate":
+        return PAGE, {"If-None-Match": etag}
+    return PAGE, {}
+
+
+def run(host, port, mode, concurrency, total, etag, offset):
+    latencies = []
+    sizes = []
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def client():
+        connection = http.client.HTTPConnection(host, port)
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                connection.close()
+                return
+            path, headers = mode_request(mode, offset + n, etag)
+            started = time.perf_counter()
+            _, body = request(connection, path, headers)
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                sizes.append(len(body))
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, sizes, time.perf_counter() - started
+
+
+def start_local_api(fixture_entries):
+    """Ingests the fixtures into a temporary store and serves it; returns (host, port)."""
+    from api import FeedApi, make_server
+    from article_store import ArticleStore
+    from config import RSS_FEEDS
+    from ingest_worker import ingest_once
+
+    store = ArticleStore(os.path.join(tempfile.mkdtemp(), "articles.sqlite3"))
+    with FixtureServer() as fixtures:
+        feeds = {name: fixtures.feed_url(source, fixture_entries) for name, source in zip(RSS_FEEDS, ("sakshi", "eenadu"))}
+        ingest_once(store, feeds=feeds)
+    server = make_server(FeedApi(store), "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="a running api.py (default: start one over the fixtures)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per mode and concurrency level")
+    parser.add_argument("--fixture-entries", type=int, default=200, help="entries per fixture feed without --url")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlparse(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = start_local_api(args.fixture_entries)
+    response, _ = request(http.client.HTTPConnection(host, port), PAGE, {})
+    etag = response.getheader("ETag")
+
+    offset = 0 # Uncached requests never repeat a page, even across concurrency levels
+    print(f"{'mode':<11} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'bytes':>7}")
+    for mode in ("uncached", "cached", "gzip", "revalidate"):
+        for concurrency in args.concurrency:
+            latencies, sizes, elapsed = run(host, port, mode, concurrency, args.requests, etag, offset)
+            offset += args.requests
+            print(f"{mode:<11} {concurrency:>7} {len(latencies) / elapsed:>9.0f} {percentile(latencies, 0.5) * 1000:>8.2f}"
+                  f" {percentile(latencies, 0.95) * 1000:>8.2f} {sum(sizes) / len(sizes):>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
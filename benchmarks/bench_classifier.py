@@ -0,0 +1,55 @@
+"""Throughput benchmark for the keyword category classifier.
+
+    python benchmarks/bench_classifier.py [--articles 20000] [--batch-sizes 1 32 256 2048]
+
+Builds synthetic Telugu/English headlines from the category keywords plus
+filler words and reports articles per second for each batch size.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classifier import CATEGORY_KEYWORDS, KeywordClassifier
+
+FILLER_WORDS = [
+    "today", "new", "says", "after", "report", "officials", "week", "plan", "over", "first",
+    "నేడు", "కొత్త", "ప్రకటన", "తర్వాత", "అధికారులు", "వారం", "ప్రణాళిక", "మొదటి", "విషయం", "చర్చ",
+]
+
+
+def make_articles(count, seed=0):
+    rng = random.Random(seed)
+    categories = list(CATEGORY_KEYWORDS)
+    articles = []
+    for _ in range(count):
+        keywords = CATEGORY_KEYWORDS[rng.choice(categories)]
+        title = rng.sample(keywords, 2) + rng.sample(FILLER_WORDS, 5)
+        rng.shuffle(title)
+        summary = rng.sample(FILLER_WORDS, 8) + [rng.choice(keywords)]
+        articles.append({"title": " ".join(title), "summary": " ".join(summary)})
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256, 2048])
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles)
+    print(f"{args.articles} synthetic articles")
+    for batch_size in args.batch_sizes:
+        classifier = KeywordClassifier() # Fresh instance so the word lookup memo starts cold
+        started = time.perf_counter()
+        for start in range(0, len(articles), batch_size):
+            classifier.predict(articles[start:start + batch_size])
+        elapsed = time.perf_counter() - started
+        print(f"batch size {batch_size:>5}: {len(articles) / elapsed:>10,.0f} articles/s ({elapsed:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
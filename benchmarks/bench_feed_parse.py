@@ -0,0 +1,125 @@
+"""CPU time and memory of feed parsing: feedparser vs the streaming parser (feed_parser.py).
+
+    python benchmarks/bench_feed_parse.py [--sizes 100 1000 10000] [--repeats 5] [--json results.json]
+
+Feeds are the recorded Sakshi/Eenadu fixtures repeated to each size (see
+fixture_server.build_feed), parsed from bytes in this process, so no network
+is involved. For each parser:
+
+    feedparser      ingest.parse_feed(body, streaming=False)
+    streaming       ingest.parse_feed(body), the default
+    streaming_iter  ingest.iter_articles(body) consumed one article at a time, nothing kept
+
+and reports median CPU time per feed, time to the first article, and the
+peak Python heap (tracemalloc) while parsing. Articles from both parsers are
+also compared field by field (summaries aside, which streaming keeps as text).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import SOURCES, build_feed
+from ingest import iter_articles, parse_feed
+
+COMPARED_FIELDS = ("guid", "title", "link", "published", "image_url", "summary")
+
+
+def parse_with_feedparser(body):
+    return parse_feed(body, streaming=False)
+
+
+def parse_streaming(body):
+    return parse_feed(body)
+
+
+def consume_streaming(body):
+    count = 0
+    for _ in iter_articles(body):
+        count += 1
+    return count
+
+
+PARSERS = {
+    "feedparser": parse_with_feedparser,
+    "streaming": parse_streaming,
+    "streaming_iter": consume_streaming,
+}
+
+
+def first_article_seconds(name, body):
+    started = time.perf_counter()
+    if name == "feedparser":
+        parse_with_feedparser(body)[0] # Nothing is available before the whole feed is parsed
+    else:
+        next(iter_articles(body))
+    return time.perf_counter() - started
+
+
+def cpu_seconds(function, body, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.process_time()
+        function(body)
+        samples.append(time.process_time() - started)
+    return statistics.median(samples)
+
+
+def peak_bytes(function, body):
+    tracemalloc.start()
+    try:
+        function(body)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def mismatches(body):
+    """Entries whose compared fields differ between the two parsers (plus any difference in count)."""
+    expected, actual = parse_with_feedparser(body), parse_streaming(body)
+    differing = sum(
+        1 for a, b in zip(expected, actual) if any(a[field] != b[field] for field in COMPARED_FIELDS)
+    )
+    return differing + abs(len(expected) - len(actual))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        for source in SOURCES:
+            body = build_feed(source, size, "http://127.0.0.1")
+            differing = mismatches(body)
+            for name, function in PARSERS.items():
+                results.append({
+                    "parser": name,
+                    "source": source,
+                    "size": size,
+                    "feed_kb": len(body) / 1024,
+                    "cpu_ms": cpu_seconds(function, body, args.repeats) * 1000,
+                    "first_article_ms": first_article_seconds(name, body) * 1000,
+                    "peak_mb": peak_bytes(function, body) / 2**20,
+                    "mismatches": differing,
+                })
+
+    print(f"{'parser':<15} {'source':<7} {'size':>6} {'feed KB':>8} {'cpu ms':>9} {'first ms':>9} {'peak MB':>8} {'diff':>5}")
+    for row in results:
+        print(f"{row['parser']:<15} {row['source']:<7} {row['size']:>6} {row['feed_kb']:>8.0f} {row['cpu_ms']:>9.1f}"
+              f" {row['first_article_ms']:>9.2f} {row['peak_mb']:>8.2f} {row['mismatches']:>5}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Offline benchmark of the ingest -> enrich -> translate -> render pipeline.
+
+    python benchmarks/bench_pipeline.py [--sizes 10 100 1000 10000] [--repeats 5] [--enrich-limit 200]
+                                        [--translate] [--json results.json]
+
+Everything runs against fixture_server.py, which serves recorded Sakshi/Eenadu
+style feeds (repeated to each feed size), article pages and a weather
+response from localhost, so results don't depend on the live sites. Each
+stage is timed separately and reports p50/p95 latency and throughput:
+
+    rss_parse         get_news_from_rss (fetch + parse, no enrichment), per feed
+    image_extraction  extract_image_url, per entry
+    enrichment        enrich_article (newspaper3k on the article page), per article
+    translation       translate_batch, per batch (only with --translate; loads the model)
+    card_render       cards.card_view, per card
+    weather           weather API request + JSON decode, per request
+
+Compare the --json output of two runs to catch regressions.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedparser
+
+from bench_translation import SAMPLE_HEADLINES
+from cards import card_view
+from fixture_server import SOURCES, FixtureServer
+from http_client import HttpClient
+from ingest import enrich_article, extract_image_url, get_news_from_rss
+from translation import needs_translation
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(stage, size, latencies, items):
+    """One result row: latencies are seconds per operation, `items` is how many entries they covered."""
+    total = sum(latencies)
+    return {
+        "stage": stage,
+        "size": size,
+        "operations": len(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "items_per_second": items / total if total else float("inf"),
+    }
+
+
+def timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def bench_rss_parse(server, client, size, repeats):
+    latencies = []
+    for _ in range(repeats):
+        for source in SOURCES:
+            latencies.append(timed(get_news_from_rss, server.feed_url(source, size), client=client, enrich=False)[1])
+    return summarize("rss_parse", size, latencies, size * len(latencies))
+
+
+def bench_image_extraction(server, size):
+    entries = [e for source in SOURCES for e in feedparser.parse(server.feed(source, size)).entries]
+    latencies = [timed(extract_image_url, entry)[1] for entry in entries]
+    return summarize("image_extraction", size, latencies, len(latencies))
+
+
+def bench_enrichment(articles, client, size, limit):
+    latencies = []
+    for article in articles[:limit]:
+        article = dict(article, image_url=None, summary="") # Force a full page fetch and parse
+        latencies.append(timed(enrich_article, article, client)[1])
+    return summarize("enrichment", size, latencies, len(latencies))
+
+
+def bench_card_render(articles, size):
+    stored = [dict(a, source="Sakshi", alternates=[]) for a in articles]
+    latencies = [timed(card_view, article)[1] for article in stored]
+    return summarize("card_render", size, latencies, len(latencies))
+
+
+def bench_weather(server, client, repeats):
+    latencies = [timed(lambda: client.get(server.weather_url(), params={"q": "Hyderabad"}).json())[1]
+                 for _ in range(repeats * 10)]
+    return summarize("weather", 1, latencies, len(latencies))
+
+
+def bench_translation(articles, batch_size):
+    from translation import load_model, translate_batch
+
+    tokenizer, model = load_model()
+    translate_batch(SAMPLE_HEADLINES[:1], tokenizer, model, batch_size=1) # Warm-up
+    titles = list(dict.fromkeys([a["title"] for a in articles if needs_translation(a["title"])] + SAMPLE_HEADLINES))
+    _, batch_stats = translate_batch(titles, tokenizer, model, batch_size=batch_size)
+    return summarize("translation", len(titles), [b["seconds"] for b in batch_stats], len(titles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--enrich-limit", type=int, default=200, help="articles enriched per feed size")
+    parser.add_argument("--translate", action="store_true", help="also benchmark translation (loads the model)")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    client = HttpClient() # No disk cache: every feed request is a full download and parse
+    with FixtureServer() as server:
+        for size in args.sizes:
+            articles = get_news_from_rss(server.feed_url(SOURCES[0], size), client=client, enrich=False)
+            results.append(bench_rss_parse(server, client, size, args.repeats))
+            results.append(bench_image_extraction(server, size))
+            results.append(bench_enrichment(articles, client, size, args.enrich_limit))
+            results.append(bench_card_render(articles, size))
+        results.append(bench_weather(server, client, args.repeats))
+        if args.translate:
+            results.append(bench_translation(articles, args.batch_size))
+
+    print(f"{'stage':<17} {'size':>6} {'ops':>6} {'p50 ms':>9} {'p95 ms':>9} {'items/s':>11}")
+    for row in results:
+        print(f"{row['stage']:<17} {row['size']:>6} {row['operations']:>6} {row['p50_ms']:>9.3f}"
+              f" {row['p95_ms']:>9.3f} {row['items_per_second']:>11,.0f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
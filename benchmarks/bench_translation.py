@@ -0,0 +1,113 @@
+"""Accuracy vs. latency benchmark for the translation backends and decoding presets.
+
+    python benchmarks/bench_translation.py [--backends torch int8 onnx] [--presets quality balanced fast]
+                                           [--threads 4] [--batch-size 16] [--repeats 3]
+
+Translates a fixed set of sample headlines with every backend/preset pair.
+The full-precision "quality" output (the original settings) is the reference:
+each pair reports seconds per headline and its chrF score and exact-match
+rate against that reference. Backends that fail to load are reported and skipped.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation import BACKENDS, DECODING_PRESETS, load_model, translate_batch
+
+SAMPLE_HEADLINES = [
+    "Heavy rains lash Hyderabad, IMD issues orange alert for Telangana",
+    "Chief Minister reviews flood relief measures in Vijayawada",
+    "Sensex jumps 600 points as banking stocks rally",
+    "India beat Australia by six wickets in the second ODI",
+    "Police arrest three in cyber fraud case worth Rs 2 crore",
+    "APPSC releases notification for 1,200 group II posts",
+    "Prabhas new film trailer crosses 50 million views in a day",
+    "Cyclone likely to make landfall near Machilipatnam on Thursday",
+    "Gold prices fall for the third consecutive day",
+    "Election Commission announces schedule for municipal polls",
+    "Metro rail services extended to the airport from next month",
+    "Farmers demand higher minimum support price for paddy",
+    "Temperatures drop to 8 degrees in Adilabad district",
+    "Video of elephant crossing highway goes viral on social media",
+    "Supreme Court to hear petition on state bifurcation issues",
+    "New IT park in Visakhapatnam to create 10,000 jobs",
+    "Tirumala temple records highest ever hundi collection",
+    "Health department launches dengue awareness drive",
+    "Union Budget allocates funds for Polavaram project",
+    "PV Sindhu enters quarterfinals of the Denmark Open",
+]
+
+
+def chrf(hypothesis, reference, max_order=6, beta=2.0):
+    """Character n-gram F-score (chrF, 0-100) of one hypothesis against one reference."""
+    hypothesis, reference = hypothesis.replace(" ", ""), reference.replace(" ", "")
+    precisions, recalls = [], []
+    for n in range(1, max_order + 1):
+        hyp = Counter(hypothesis[i:i + n] for i in range(len(hypothesis) - n + 1))
+        ref = Counter(reference[i:i + n] for i in range(len(reference) - n + 1))
+        if not hyp or not ref:
+            continue
+        overlap = sum((hyp & ref).values())
+        precisions.append(overlap / sum(hyp.values()))
+        recalls.append(overlap / sum(ref.values()))
+    if not precisions:
+        return 100.0 if hypothesis == reference else 0.0
+    precision, recall = statistics.mean(precisions), statistics.mean(recalls)
+    if precision + recall == 0:
+        return 0.0
+    return 100 * (1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall)
+
+
+def run(tokenizer, model, preset, batch_size, repeats):
+    """Returns `(translations, seconds_per_headline)`, the median over `repeats` uncached runs."""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        translations, _ = translate_batch(SAMPLE_HEADLINES, tokenizer, model, batch_size=batch_size,
+                                          **DECODING_PRESETS[preset])
+        timings.append((time.perf_counter() - started) / len(SAMPLE_HEADLINES))
+    return translations, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--presets", nargs="+", choices=sorted(DECODING_PRESETS), default=list(DECODING_PRESETS))
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    # Reference: the original full-precision model with the original decoding settings
+    tokenizer, model = load_model(backend="torch", num_threads=args.threads)
+    translate_batch(SAMPLE_HEADLINES[:1], tokenizer, model, batch_size=1) # Warm-up
+    reference, reference_seconds = run(tokenizer, model, "quality", args.batch_size, args.repeats)
+    print(f"{len(SAMPLE_HEADLINES)} headlines, batch size {args.batch_size}, threads {args.threads or 'default'}")
+    print(f"{'backend':<8} {'preset':<9} {'ms/headline':>12} {'speedup':>8} {'chrF':>6} {'exact':>6}")
+
+    for backend in args.backends:
+        if backend != "torch":
+            try:
+                tokenizer, model = load_model(backend=backend, num_threads=args.threads)
+                translate_batch(SAMPLE_HEADLINES[:1], tokenizer, model, batch_size=1)
+            except Exception as e:
+                print(f"{backend:<8} skipped: {e}")
+                continue
+        for preset in args.presets:
+            if backend == "torch" and preset == "quality":
+                translations, seconds = reference, reference_seconds
+            else:
+                translations, seconds = run(tokenizer, model, preset, args.batch_size, args.repeats)
+            score = statistics.mean(chrf(h, r) for h, r in zip(translations, reference))
+            exact = sum(h == r for h, r in zip(translations, reference)) / len(reference)
+            print(f"{backend:<8} {preset:<9} {seconds * 1000:>12.1f} {reference_seconds / seconds:>7.2f}x"
+                  f" {score:>6.1f} {exact:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
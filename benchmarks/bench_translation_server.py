@@ -0,0 +1,74 @@
+"""Load test for translation_server.py: many sessions each asking for one title at a time.
+
+    python translation_server.py --port 8502 &
+    python benchmarks/bench_translation_server.py [--url http://127.0.0.1:8502] [--concurrency 1 8 32] [--requests 200]
+
+For each concurrency level, that many threads send single-title requests
+(sample headlines with a counter appended, so the server cache never
+answers) and the run reports titles/s, p50/p95 request latency, and the
+server's mean batch size.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_pipeline import percentile
+from bench_translation import SAMPLE_HEADLINES
+from translation_server import TranslationClient
+
+
+def run(url, concurrency, total, offset):
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def session():
+        client = TranslationClient(url)
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                return
+            text = f"{SAMPLE_HEADLINES[n % len(SAMPLE_HEADLINES)]} ({offset + n})"
+            started = time.perf_counter()
+            client.translate([text])
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=session) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8502")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="titles per concurrency level")
+    args = parser.parse_args()
+
+    client = TranslationClient(args.url)
+    client.wait_ready()
+    print(f"{'sessions':>8} {'titles/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'mean batch':>11}")
+    offset = int(time.time()) # Unique texts per run, so the server's cache doesn't answer
+    for concurrency in args.concurrency:
+        before = client.health()
+        latencies, elapsed = run(args.url, concurrency, args.requests, offset)
+        after = client.health()
+        offset += args.requests
+        batches = after["batches"] - before["batches"]
+        mean_batch = (after["texts"] - before["texts"]) / batches if batches else 0
+        print(f"{concurrency:>8} {len(latencies) / elapsed:>9.1f} {percentile(latencies, 0.5) * 1000:>9.0f}"
+              f" {percentile(latencies, 0.95) * 1000:>9.0f} {mean_batch:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Local stand-in for the news sites and weather API, serving recorded fixtures.
+
+    /rss/<source>.xml?entries=N  fixture feed (sakshi or eenadu) with its items repeated to N entries
+    /article/<source>/<n>.html   the recorded article page (every link in the feeds points here)
+    /weather?q=<city>            the recorded OpenWeatherMap response
+
+Feeds are generated once per (source, size) and kept in memory, so serving
+them costs the same for every run. Used by bench_pipeline.py:
+
+    with FixtureServer() as server:
+        get_news_from_rss(server.feed_url("sakshi", 1000))
+"""
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SOURCES = ("sakshi", "eenadu")
+
+ITEM_PATTERN = re.compile(r"<item>.*?</item>", re.S)
+LINK_PATTERN = re.compile(r"<link>.*?</link>", re.S)
+GUID_PATTERN = re.compile(r"<guid([^>]*)>.*?</guid>", re.S)
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def build_feed(source, entries, base_url):
+    """Repeats the recorded items of `source` up to `entries` items with unique GUIDs and local links."""
+    template = read_fixture(f"{source}_rss.xml").decode("utf-8")
+    items = ITEM_PATTERN.findall(template)
+    head, tail = template[:template.index(items[0])], template[template.rindex(items[-1]) + len(items[-1]):]
+    generated = []
+    for n in range(entries):
+        link = f"{base_url}/article/{source}/{n}.html"
+        item = LINK_PATTERN.sub(f"<link>{link}</link>", items[n % len(items)])
+        item = GUID_PATTERN.sub(lambda m: f"<guid{m.group(1)}>{link}</guid>", item)
+        generated.append(item)
+    return (head + "\n".join(generated) + tail).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real sites
+    disable_nagle_algorithm = True # Headers and body are separate writes; don't let them wait on delayed ACKs
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        match = re.fullmatch(r"/rss/(\w+)\.xml", url.path)
+        if match and match.group(1) in SOURCES:
+            entries = int(parse_qs(url.query).get("entries", ["10"])[0])
+            return self._send(self.server.feed(match.group(1), entries), "application/rss+xml; charset=utf-8")
+        if url.path.startswith("/article/"):
+            return self._send(self.server.fixtures["article.html"], "text/html; charset=utf-8")
+        if url.path == "/weather":
+            return self._send(self.server.fixtures["weather.json"], "application/json; charset=utf-8")
+        self._send(b"not found", "text/plain", status=404)
+
+    def _send(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Keep benchmark output clean
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Threaded HTTP server on a free localhost port; use as a context manager."""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), _Handler)
+        self.base_url = f"http://{host}:{self.server_address[1]}"
+        self.fixtures = {name: read_fixture(name) for name in ("article.html", "weather.json")}
+        self._feeds = {}
+        self._feeds_lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def feed(self, source, entries):
+        with self._feeds_lock:
+            key = (source, entries)
+            if key not in self._feeds:
+                self._feeds[key] = build_feed(source, entries, self.base_url)
+            return self._feeds[key]
+
+    def feed_url(self, source, entries):
+        return f"{self.base_url}/rss/{source}.xml?entries={entries}"
+
+    def weather_url(self):
+        return f"{self.base_url}/weather"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
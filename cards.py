@@ -0,0 +1,47 @@
+"""What a Headlines card shows, worked out without Streamlit.
+
+app.py turns each view into Streamlit calls; keeping the decisions here lets
+them be benchmarked (benchmarks/bench_pipeline.py) and reused outside the app.
+"""
+import metrics
+
+
+def card_image(image_url, thumbnail_cache):
+    """The local thumbnail for `image_url` if `thumbnail_cache` has one, otherwise the publisher's original."""
+    if not image_url or thumbnail_cache is None:
+        return image_url
+    # Small local thumbnail if we have it, otherwise the publisher's original this once
+    thumbnail = thumbnail_cache.cached_path(image_url)
+    metrics.record_cache("thumbnail", hit=thumbnail is not None)
+    return thumbnail or image_url
+
+
+def card_view(article, thumbnail_cache=None):
+    """Returns the display fields for one stored article (a dict from `ArticleStore.load_articles`).
+
+    `image` is the local thumbnail when `thumbnail_cache` has one, otherwise the
+    publisher's original. `original_title` is set only when a translated title
+    is shown in its place. Views built without a cache depend only on the
+    article, so they can be memoized and given thumbnails later with `card_image`.
+    """
+    image = card_image(article['image_url'], thumbnail_cache)
+
+    translated = article['translated_title']
+    if translated and translated != article['title']:
+        title, original_title = translated, article['title']
+    else:
+        title, original_title = article['title'], None # Original if no translation or translation failed
+
+    also_reported = None
+    if article.get('alternates'):
+        # Same story carried by other sources, grouped by the worker's dedup stage
+        also_reported = ", ".join(f"[{alt['source']}]({alt['link']})" for alt in article['alternates'])
+
+    return {
+        "image": image,
+        "title": title,
+        "original_title": original_title,
+        "summary": article['summary'],
+        "link": article['link'],
+        "also_reported": also_reported,
+    }
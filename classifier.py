@@ -0,0 +1,160 @@
+"""Fast keyword-based category classifier for TELUGU_CATEGORIES.
+
+Articles are turned into a (articles x vocabulary) count matrix and scored
+against a (vocabulary x categories) keyword-weight matrix in one NumPy
+product, so a whole ingestion batch is classified at once on the CPU.
+"""
+import numpy as np
+
+from config import DEFAULT_CATEGORY, TELUGU_CATEGORIES
+from gazetteer import stem, tokenize
+
+TITLE_WEIGHT = 2.0 # A keyword in the title counts double compared to the summary
+MIN_PREFIX_LENGTH = 4 # Shorter Telugu keywords only match whole words
+
+# English category -> keywords (English and Telugu). Telugu keywords are stemmed and
+# also match longer words they prefix ("వర్ష" -> "వర్షాలు"), since Telugu inflects by
+# suffixing. English keywords match whole words only ("exam" must not match "example"),
+# so their plural and inflected forms are listed explicitly.
+CATEGORY_KEYWORDS = {
+    "National": [
+        "india", "indian", "indians", "centre", "union", "modi", "parliament", "delhi", "supreme", "president",
+        "nationwide",
+        "కేంద్ర", "దేశ", "ప్రధాని", "మోదీ", "పార్లమెంట్", "లోక్‌సభ", "రాజ్యసభ", "ఢిల్లీ", "సుప్రీం", "రాష్ట్రపతి", "జాతీయ",
+    ],
+    "State": [
+        "telangana", "andhra", "amaravati", "cm", "assembly", "district", "districts", "collector", "collectors",
+        "ghmc", "state",
+        "తెలంగాణ", "ఆంధ్ర", "ఏపీ", "సీఎం", "ముఖ్యమంత్రి", "అసెంబ్లీ", "జిల్లా", "కలెక్టర్", "రాష్ట్ర",
+    ],
+    "Crime": [
+        "police", "arrest", "arrests", "arrested", "murder", "murders", "murdered", "theft", "thefts", "robbery",
+        "robberies", "accident", "accidents", "fraud", "frauds", "cybercrime", "killed", "smuggling", "smuggled",
+        "ganja", "scam", "scams", "accused",
+        "పోలీస్", "అరెస్ట్", "హత్య", "దొంగ", "చోరీ", "ప్రమాదం", "మోసం", "కేసు", "నిందితు", "సైబర్", "గంజాయి",
+    ],
+    "Politics": [
+        "election", "elections", "bjp", "congress", "tdp", "ysrcp", "brs", "janasena", "minister", "ministers",
+        "mla", "mlas", "mp", "mps", "party", "parties", "polls", "vote", "votes", "voting", "campaign", "campaigns",
+        "revanth", "chandrababu", "naidu", "jagan", "kcr", "ktr", "pawan",
+        "ఎన్నిక", "బీజేపీ", "కాంగ్రెస్", "టీడీపీ", "వైసీపీ", "బీఆర్ఎస్", "జనసేన", "మంత్రి", "ఎమ్మెల్యే", "ఎంపీ",
+        "పార్టీ", "ఓటు", "ప్రచారం", "రేవంత్", "చంద్రబాబు", "జగన్", "కేసీఆర్", "కేటీఆర్", "పవన్",
+    ],
+    "Business": [
+        "market", "markets", "sensex", "nifty", "share", "shares", "stock", "stocks", "rupee", "gold", "price",
+        "prices", "bank", "banks", "banking", "rbi", "gdp", "economy", "economic", "company", "companies", "ipo",
+        "tax", "taxes", "gst", "investment", "investments", "investors", "startup", "startups", "budget",
+        "మార్కెట్", "సెన్సెక్స్", "నిఫ్టీ", "షేర్", "బంగారం", "ధర", "బ్యాంక్", "ఆర్బీఐ", "ఆర్థిక", "కంపెనీ",
+        "పెట్టుబడి", "జీఎస్టీ", "పన్ను", "బడ్జెట్",
+    ],
+    "Sports": [
+        "cricket", "match", "matches", "ipl", "t20", "odi", "football", "hockey", "olympics", "kohli", "tournament",
+        "tournaments", "medal", "medals", "badminton", "wicket", "wickets", "century", "centuries", "bcci", "sindhu",
+        "క్రికెట్", "మ్యాచ్", "ఐపీఎల్", "జట్టు", "క్రీడ", "ఒలింపిక్", "పతకం", "టోర్నీ", "ఫుట్‌బాల్", "బ్యాడ్మింటన్",
+        "వికెట్", "సెంచరీ",
+    ],
+    "Entertainment": [
+        "film", "films", "movie", "movies", "actor", "actors", "actress", "tollywood", "bollywood", "trailer",
+        "teaser", "director", "song", "songs", "ott", "biggboss", "boxoffice", "prabhas", "chiranjeevi", "mahesh",
+        "allu",
+        "సినిమా", "చిత్రం", "హీరో", "హీరోయిన్", "నటుడు", "నటి", "టాలీవుడ్", "ట్రైలర్", "టీజర్", "దర్శకుడు",
+        "పాట", "బిగ్‌బాస్", "కలెక్షన్",
+    ],
+    "Jobs": [
+        "jobs", "job", "recruitment", "vacancies", "vacancy", "notification", "notifications", "exam", "exams",
+        "result", "results", "tspsc", "tgpsc", "appsc", "upsc", "hiring", "posts", "dsc", "hall", "syllabus",
+        "ఉద్యోగ", "నోటిఫికేషన్", "పోస్టులు", "నియామక", "పరీక్ష", "ఫలితాలు", "ఖాళీ", "రిక్రూట్‌మెంట్", "హాల్‌టికెట్",
+    ],
+    "Weather": [
+        "rain", "rains", "rainfall", "weather", "cyclone", "cyclones", "imd", "temperature", "temperatures", "heat",
+        "heatwave", "monsoon", "flood", "floods", "flooded", "storm", "storms", "thunderstorm", "thunderstorms",
+        "cold",
+        "వర్షం", "వర్షాలు", "వాతావరణ", "తుఫాను", "ఉష్ణోగ్రత", "ఎండ", "వడగాలు", "రుతుపవన", "వరద", "చలి", "అల్పపీడనం",
+    ],
+    "Viral": [
+        "viral", "video", "videos", "netizens", "trending", "instagram", "twitter", "youtube", "funny", "reel",
+        "reels",
+        "meme", "memes",
+        "వైరల్", "వీడియో", "నెటిజన్", "సోషల్", "ట్రెండ్", "ఇన్‌స్టాగ్రామ్", "రీల్", "మీమ్",
+    ],
+}
+
+# Broad words that show up across categories count half as much as specific keywords
+WEAK_KEYWORDS = {
+    "india", "indian", "indians", "state", "district", "districts", "union", "video", "videos", "price", "prices",
+    "party", "parties", "దేశ", "రాష్ట్ర", "జిల్లా",
+}
+WEAK_KEYWORD_WEIGHT = 0.5
+
+CATEGORY_NAMES = list(TELUGU_CATEGORIES.values()) # Column order of the score matrix
+
+
+class KeywordClassifier:
+    """Scores articles against CATEGORY_KEYWORDS with one matrix product per batch."""
+
+    def __init__(self, category_keywords=CATEGORY_KEYWORDS, categories=CATEGORY_NAMES, default=DEFAULT_CATEGORY):
+        self.categories = list(categories)
+        self.default = default
+        self.vocabulary = {}
+        self._prefixes = set() # Stemmed Telugu keywords, which also match words they prefix
+        entries = []
+        for column, category in enumerate(self.categories):
+            for keyword in category_keywords.get(category, []):
+                weight = WEAK_KEYWORD_WEIGHT if keyword in WEAK_KEYWORDS else 1.0
+                for token in tokenize(keyword):
+                    term = stem(token)
+                    index = self.vocabulary.setdefault(term, len(self.vocabulary))
+                    entries.append((index, column, weight))
+                    if not term.isascii():
+                        self._prefixes.add(term)
+        self.weights = np.zeros((len(self.vocabulary), len(self.categories)), dtype=np.float32)
+        for index, column, weight in entries:
+            self.weights[index, column] = weight
+        self._max_prefix_length = max((len(t) for t in self._prefixes), default=0)
+        self._token_cache = {}
+
+    def _term_index(self, token):
+        """Vocabulary index for a word: exact match first, then (Telugu only) its longest keyword prefix."""
+        if token in self._token_cache:
+            return self._token_cache[token]
+        index = self.vocabulary.get(token)
+        if index is None and not token.isascii():
+            for length in range(min(len(token), self._max_prefix_length), MIN_PREFIX_LENGTH - 1, -1):
+                if token[:length] in self._prefixes:
+                    index = self.vocabulary[token[:length]]
+                    break
+        if len(self._token_cache) < 200000: # Bounded memo of word -> index lookups
+            self._token_cache[token] = index
+        return index
+
+    def _features(self, articles):
+        counts = np.zeros((len(articles), len(self.vocabulary)), dtype=np.float32)
+        for row, article in enumerate(articles):
+            for text, weight in ((article.get("title"), TITLE_WEIGHT), (article.get("summary"), 1.0)):
+                for token in tokenize(text):
+                    index = self._term_index(token)
+                    if index is not None:
+                        counts[row, index] += weight
+        return counts
+
+    def predict(self, articles):
+        """Returns one category name per article (DEFAULT_CATEGORY when no keyword matches)."""
+        if not articles:
+            return []
+        scores = self._features(articles) @ self.weights
+        best = scores.argmax(axis=1)
+        has_match = scores.max(axis=1) > 0
+        return [self.categories[b] if matched else self.default for b, matched in zip(best, has_match)]
+
+
+_default_classifier = None
+
+
+def classify_articles(articles):
+    """Sets `category` (an English TELUGU_CATEGORIES value) on each article dict, in place."""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = KeywordClassifier()
+    for article, category in zip(articles, _default_classifier.predict(articles)):
+        article["category"] = category
+    return articles
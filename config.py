@@ -0,0 +1,131 @@
+"""Settings shared by the Streamlit app (app.py) and the ingestion worker (ingest_worker.py)."""
+
+# --- News Categories (Telugu label -> English name) ---
+TELUGU_CATEGORIES = {
+    "జాతీయ వార్తలు": "National",
+    "రాష్ట్ర వార్తలు": "State",
+    "క్రైం": "Crime",
+    "రాజకీయాలు": "Politics",
+    "వ్యాపారం": "Business",
+    "క్రీడలు": "Sports",
+    "వినోదం": "Entertainment",
+    "ఉద్యోగాలు": "Jobs",
+    "వాతావరణం": "Weather",
+    "వైరల్": "Viral",
+}
+
+# Category given to articles that match no category keywords (see classifier.py)
+DEFAULT_CATEGORY = "State"
+
+# --- RSS Feed URLs ---
+# These are examples. You might need to verify their current validity and content.
+# Some news sites do not offer comprehensive RSS feeds, and scraping might be needed.
+RSS_FEEDS = {
+    "Sakshi": "https://www.sakshi.com/tags/rss", # This appears to be a general RSS for Sakshi.
+    "Eenadu": "https://www.eenadu.net/telugu-news/rss", # This URL from search might be old/unofficial.
+    # Way2News does not appear to have a public RSS feed, requiring scraping if you want its content.
+    # For now, let's stick to sources that publicly offer RSS.
+    # You might consider other major Telugu news sources like ABN Andhra Jyothy, TV9 Telugu if they have RSS.
+}
+
+# --- Shared HTTP Layer (feeds, article pages, weather) ---
+HTTP_CONNECT_TIMEOUT = 5 # Seconds
+HTTP_READ_TIMEOUT = 10 # Seconds
+HTTP_PER_HOST_LIMIT = 2 # Concurrent requests allowed against any one site
+HTTP_CACHE_DIR = "data/http_cache" # Feed bodies kept for ETag/Last-Modified revalidation
+
+# --- Ingestion Configuration ---
+# Feeds are fetched in parallel; newspaper3k enrichment runs on a bounded worker pool.
+INGEST_MAX_WORKERS = 8
+# Ingestion runs (the worker's and the app's per-feed refresh) take turns through a lease in the store
+INGEST_LEASE_SECONDS = 60 # Renewed while a run is alive; a crashed run's lease is taken over after this
+INGEST_LEASE_WAIT = 120 # Longest an app refresh waits for a running ingestion to finish
+INGEST_POLL_INTERVAL = 300 # Starting poll interval of each feed; scheduler.py adapts it per feed
+FEED_MIN_INTERVAL = 60 # Fastest a feed is polled, however often it publishes
+FEED_MAX_INTERVAL = 1800 # Slowest a healthy feed is polled
+FEED_CADENCE_FACTOR = 0.5 # Poll interval as a share of the feed's learnt publish cadence
+FEED_BACKOFF_MAX = 6 * 3600 # Longest wait before retrying a failing feed
+FEED_MAX_CONCURRENT = 4 # Feeds polled at once across all sources
+DEDUP_MAX_ENTRIES = 20000 # Recent stories remembered for near-duplicate clustering across sources
+DEDUP_MAX_AGE = 36 * 3600 # Stories older than this aren't clustered against (recurring daily headlines)
+
+# --- Weather (see weather.py) ---
+WEATHER_API_URL = "http://api.openweathermap.org/data/2.5/weather" # Point at a local mock for testing
+WEATHER_FRESH_SECONDS = 600 # Served without asking the API again
+WEATHER_STALE_SECONDS = 3600 # Served immediately while a background request refreshes it
+WEATHER_ERROR_SECONDS = 60 # Failed lookups (e.g. unknown cities) aren't retried sooner than this
+WEATHER_MAX_CITIES = 256 # Least recently used cities are dropped past this
+# Kept warm in the background so the most searched districts never wait on the API
+WEATHER_POPULAR_CITIES = [
+    "Hyderabad", "Visakhapatnam", "Vijayawada", "Warangal", "Guntur", "Tirupati", "Nellore", "Kurnool",
+    "Karimnagar", "Khammam", "Nizamabad", "Rajahmundry", "Kakinada", "Anantapur",
+]
+
+# --- Visitor Location (see geoip.py) ---
+# MaxMind-format city database (e.g. GeoLite2-City.mmdb); without it "My Location" defaults to Hyderabad
+GEOIP_DATABASE_PATH = "data/GeoLite2-City.mmdb"
+GEOIP_CACHE_SIZE = 4096 # Recently seen client IPs kept in memory
+# Reverse proxies in front of the app; their X-Real-IP / X-Forwarded-For entries are trusted. 0 if visitors
+# connect directly, in which case forwarding headers (which the client can forge) are ignored.
+GEOIP_TRUSTED_PROXIES = 1
+
+# --- Metrics (see metrics.py) ---
+# Each process serves Prometheus text at http://METRICS_HOST:<port>/metrics; None turns an endpoint off.
+METRICS_HOST = "127.0.0.1"
+APP_METRICS_PORT = 9102
+WORKER_METRICS_PORT = 9101
+METRICS_ADMIN_PANEL = False # Show per-stage timings and cache hit rates in the app sidebar
+
+# --- Article Store (written by ingest_worker.py, read by app.py) ---
+ARTICLE_STORE_PATH = "data/articles.sqlite3"
+
+# --- Trending Terms (see trends.py) ---
+# Article counts per term over a sliding window of hourly buckets, in count-min sketches of fixed size.
+TRENDS_BUCKET_SECONDS = 3600
+TRENDS_WINDOW_BUCKETS = 24 # Window length in buckets (a day)
+TRENDS_RECENT_BUCKETS = 2 # Buckets compared against the rest of the window to spot bursts
+TRENDS_SKETCH_WIDTH = 4096 # Counters per sketch row; memory is WINDOW_BUCKETS x DEPTH x WIDTH x 4 bytes
+TRENDS_SKETCH_DEPTH = 4
+TRENDS_MAX_CANDIDATES = 512 # Heavy-hitter terms tracked for ranking
+TRENDS_MIN_COUNT = 3 # Recent articles a term needs before it can trend
+TRENDS_MIN_SCORE = 2.0 # Burst score (excess over the usual rate, in standard deviations) needed to trend
+TRENDS_SHOWN = 10 # Terms in the Headlines tab's Trending strip
+
+# --- Headlines Grid ---
+HEADLINES_PAGE_SIZE = 12 # Cards per page ("load more" adds another page); a multiple of the 3 grid columns
+HEADLINES_PAGE_SIZE_OPTIONS = [6, 12, 24, 48]
+
+# --- Card Thumbnails ---
+THUMBNAIL_CACHE_DIR = "data/thumbnails" # Downscaled card images, served instead of publisher originals
+THUMBNAIL_CACHE_MAX_BYTES = 200 * 1024 * 1024 # Least recently used thumbnails are evicted past this size
+THUMBNAIL_ERROR_SECONDS = 900 # Images that failed to download or decode aren't retried sooner than this
+
+# --- Translation Configuration ---
+# Titles are translated together in batches of this size; tune it with the per-batch timings the worker logs.
+TRANSLATION_BATCH_SIZE = 16
+# Translations are cached on disk (survives restarts) with an in-memory LRU in front.
+TRANSLATION_CACHE_PATH = "data/translations.sqlite3"
+TRANSLATION_CACHE_MEMORY_ENTRIES = 10000
+# Inference backend ("torch", "int8" or "onnx"), decoding preset ("quality", "balanced" or "fast")
+# and CPU thread count (None = library default); see translation.py and benchmarks/bench_translation.py.
+TRANSLATION_BACKEND = "torch"
+TRANSLATION_PRESET = "quality"
+TRANSLATION_THREADS = None
+TRANSLATION_ONNX_DIR = "data/onnx" # The "onnx" backend exports the model here once and reuses it
+# Shared translation server (translation_server.py). When set, the app and the worker send titles
+# there instead of each loading their own model.
+TRANSLATION_SERVER_URL = None # e.g. "http://127.0.0.1:8502"
+TRANSLATION_SERVER_MAX_BATCH = 32 # Most titles per generate call
+TRANSLATION_SERVER_MAX_WAIT_MS = 25 # How long a batch waits for titles from other sessions
+TRANSLATION_SERVER_QUEUE_SIZE = 512 # Queued titles before new requests are turned away (HTTP 503)
+
+# --- JSON API (api.py) ---
+# Read-only article, trending and weather endpoints for clients other than the Streamlit app
+API_HOST = "127.0.0.1"
+API_PORT = 8503
+API_PAGE_SIZE = 20 # Articles per page unless ?per_page= says otherwise
+API_MAX_PAGE_SIZE = 100
+API_CACHE_ENTRIES = 1024 # Built responses (with their compressed encodings) kept in memory
+API_VERSION_CHECK_SECONDS = 1.0 # How often the store version is re-read; cached responses can be this stale
+API_COMPRESS_MIN_BYTES = 512 # Smaller bodies aren't worth compressing
+API_MAX_AGE = 60 # Cache-Control max-age; clients revalidate with If-None-Match after this
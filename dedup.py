@@ -0,0 +1,129 @@
+"""Near-duplicate story detection across feeds.
+
+Each article gets a 64-bit SimHash over normalized Telugu/English tokens of
+its title and summary. Fingerprints are split into bands and bucketed, so
+finding a match only looks at articles sharing a band (roughly linear time
+overall) instead of comparing against every article seen so far.
+"""
+import hashlib
+import time
+from collections import OrderedDict, defaultdict
+
+from gazetteer import tokenize
+
+FINGERPRINT_BITS = 64
+MAX_DISTANCE = 6 # Hamming distance at or below which two stories count as the same
+# With MAX_DISTANCE + 1 bands, two fingerprints within MAX_DISTANCE bits must agree on at least one band
+NUM_BANDS = MAX_DISTANCE + 1
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_MAX_AGE = 36 * 3600 # Seconds; older stories are not matched
+
+def _features(text):
+    """Word tokens plus character trigrams, so small inflection differences still overlap."""
+    features = defaultdict(int)
+    for token in tokenize(text):
+        features["w:" + token] += 2
+        for i in range(len(token) - 2):
+            features["c:" + token[i:i + 3]] += 1
+    return features
+
+
+def _hash64(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text):
+    """Returns the 64-bit SimHash of `text` (0 for text with no tokens)."""
+    weights = [0] * FINGERPRINT_BITS
+    for feature, weight in _features(text).items():
+        h = _hash64(feature)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += weight if h >> bit & 1 else -weight
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def article_fingerprint(article):
+    return simhash(f"{article['title']} {article.get('summary') or ''}")
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _bands(fingerprint):
+    width = FINGERPRINT_BITS // NUM_BANDS
+    mask = (1 << width) - 1
+    return [(band, fingerprint >> (band * width) & mask) for band in range(NUM_BANDS)]
+
+
+class Deduplicator:
+    """Streaming clusterer: `add` returns the id of an earlier near-duplicate, or None for a new story.
+
+    Only the most recent `max_entries` cluster heads, seen within the last
+    `max_age` seconds, are remembered, so memory stays bounded and recurring
+    headlines start a new story each day. Stories from the same source are
+    never clustered together: a feed repeating itself is a new post, not a
+    second report of the same news.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_age=DEFAULT_MAX_AGE):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict() # id -> (fingerprint, source, seen_at), oldest first
+        self._buckets = defaultdict(set) # (band, value) -> ids
+
+    def find(self, fingerprint, source=None, now=None):
+        """Returns the id of the closest remembered story within MAX_DISTANCE from another source, or None."""
+        self._expire(time.time() if now is None else now)
+        best_id, best_distance = None, MAX_DISTANCE + 1
+        for key in _bands(fingerprint):
+            for candidate in self._buckets.get(key, ()):
+                candidate_fingerprint, candidate_source, _ = self._entries[candidate]
+                if source is not None and candidate_source == source:
+                    continue
+                distance = hamming_distance(fingerprint, candidate_fingerprint)
+                if distance < best_distance:
+                    best_id, best_distance = candidate, distance
+        return best_id
+
+    def remember(self, item_id, fingerprint, source=None, seen_at=None):
+        self._entries[item_id] = (fingerprint, source, time.time() if seen_at is None else seen_at)
+        for key in _bands(fingerprint):
+            self._buckets[key].add(item_id)
+        while len(self._entries) > self.max_entries:
+            self._forget_oldest()
+
+    def _expire(self, now):
+        # Entries are remembered in the order they were seen, so expired ones are at the front
+        while self._entries and now - next(iter(self._entries.values()))[2] > self.max_age:
+            self._forget_oldest()
+
+    def _forget_oldest(self):
+        old_id, (old_fingerprint, _, _) = self._entries.popitem(last=False)
+        for key in _bands(old_fingerprint):
+            self._buckets[key].discard(old_id)
+            if not self._buckets[key]:
+                del self._buckets[key]
+
+    def add(self, item_id, fingerprint, source=None, now=None):
+        """Clusters one story; new stories become cluster heads for later duplicates."""
+        now = time.time() if now is None else now
+        match = self.find(fingerprint, source, now)
+        if match is None:
+            self.remember(item_id, fingerprint, source, now)
+        return match
+
+
+def cluster_articles(articles, deduplicator, source=None):
+    """Sets `fingerprint` and `cluster_guid` on each article of `source` (in place) and returns the cluster heads.
+
+    `cluster_guid` is None for a new story and the head's guid for a near-duplicate,
+    so only the returned heads need enriching and translating.
+    """
+    heads = []
+    for article in articles:
+        article["fingerprint"] = article_fingerprint(article)
+        article["cluster_guid"] = deduplicator.add(article["guid"], article["fingerprint"], source)
+        if article["cluster_guid"] is None:
+            heads.append(article)
+    return heads
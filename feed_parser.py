@@ -0,0 +1,170 @@
+"""Streaming RSS/Atom parsing without feedparser or a DOM per entry.
+
+`iter_entries` feeds the document to an incremental XML parser chunk by chunk
+and yields each <item>/<entry> as soon as its closing tag has been read, then
+drops it, so memory stays flat however long the feed is. Description HTML
+goes through one pass of the standard library's HTMLParser (`html_fields`),
+which keeps the text and the first <img> src and builds no tree.
+
+Malformed XML raises `xml.etree.ElementTree.ParseError`; ingest.parse_feed
+then falls back to feedparser, which tolerates it.
+"""
+from html.parser import HTMLParser
+from xml.etree.ElementTree import XMLPullParser
+
+CHUNK_SIZE = 64 * 1024
+ENTRY_TAGS = ("item", "entry") # RSS 0.9x/1.0/2.0 items and Atom entries
+MEDIA_CONTENT = "{http://search.yahoo.com/mrss/}content"
+# Elements in other namespaces (media:title, dc:*, ...) never stand in for the entry's own fields
+FEED_NAMESPACES = ("", "http://www.w3.org/2005/Atom", "http://purl.org/rss/1.0/")
+SKIPPED_TEXT_TAGS = ("script", "style")
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _HtmlFields(HTMLParser):
+    """Collects the text of an HTML fragment and the src of its first <img>, in one pass."""
+
+    def __init__(self, want_text=True):
+        super().__init__(convert_charrefs=True)
+        self.want_text = want_text
+        self.parts = []
+        self.image_url = None
+        self.seen_image = False
+        self._skipping = 0 # Depth inside <script>/<style>
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "img" and not self.seen_image:
+            # Like the old BeautifulSoup lookup, only the first <img> counts, with or without a src
+            self.seen_image = True
+            self.image_url = dict(attrs).get("src")
+            if not self.want_text:
+                raise _StopParsing
+        elif tag in SKIPPED_TEXT_TAGS:
+            self._skipping += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TEXT_TAGS and self._skipping:
+            self._skipping -= 1
+
+    def handle_data(self, data):
+        if self.want_text and not self._skipping:
+            self.parts.append(data)
+
+
+def html_fields(markup, want_text=True):
+    """Returns `(text, first_image_src)` for an HTML fragment.
+
+    The text is plain (entities decoded, tags dropped) with its whitespace
+    collapsed; whoever renders it as HTML escapes it. Plain-text input skips the parser entirely.
+    """
+    if not markup:
+        return "", None
+    if "<" not in markup and "&" not in markup:
+        return " ".join(markup.split()) if want_text else "", None
+    if not want_text and "<img" not in markup.lower():
+        return "", None
+    parser = _HtmlFields(want_text)
+    try:
+        parser.feed(markup)
+        parser.close()
+    except _StopParsing:
+        pass
+    text = " ".join("".join(parser.parts).split()) if want_text else ""
+    return text, parser.image_url
+
+
+def first_image(markup):
+    """The src of the first <img> in an HTML fragment, or None."""
+    return html_fields(markup, want_text=False)[1]
+
+
+def _local_name(tag):
+    """The tag without its namespace, or None if the namespace isn't one of the feed formats'."""
+    if tag[:1] != "{":
+        return tag
+    namespace, _, name = tag[1:].partition("}")
+    return name if namespace in FEED_NAMESPACES else None
+
+
+def _text(element):
+    return "".join(element.itertext()).strip()
+
+
+def _entry(element):
+    """Turns a finished <item>/<entry> element into a plain dict (see `iter_entries`)."""
+    fields = {}
+    for child in element:
+        name = _local_name(child.tag)
+        if name == "link":
+            if "link" in fields:
+                continue
+            if child.get("href"): # Atom
+                if child.get("rel", "alternate") == "alternate":
+                    fields["link"] = child.get("href").strip()
+            elif _text(child): # RSS
+                fields["link"] = _text(child)
+        elif name == "title":
+            fields.setdefault("title", _text(child))
+        elif name in ("guid", "id"):
+            fields.setdefault("id", _text(child))
+        elif name in ("description", "summary"):
+            fields.setdefault("description", _text(child))
+        elif name in ("pubDate", "published"):
+            fields.setdefault("published", _text(child))
+
+    # As with feedparser entries: media:content decides the image when present, else the description's first <img>
+    media = list(element.iter(MEDIA_CONTENT))
+    summary, image_url = html_fields(fields.get("description", ""), want_text=True)
+    if media:
+        image_url = next(
+            (m.get("url") for m in media if m.get("url") and (m.get("type") or "").startswith("image")), None
+        )
+    return {
+        "title": fields.get("title", ""),
+        "link": fields.get("link", ""),
+        "id": fields.get("id", ""),
+        "summary": summary,
+        "published": fields.get("published"),
+        "image_url": image_url,
+    }
+
+
+def _chunks(data, size=CHUNK_SIZE):
+    view = memoryview(data)
+    for start in range(0, len(view), size):
+        yield view[start:start + size]
+
+
+def iter_entries(source, chunk_size=CHUNK_SIZE):
+    """Yields the entries of an RSS/Atom feed as dicts, in feed order, as soon as each is complete.
+
+    `source` is the whole document as bytes or any iterable of byte chunks
+    (e.g. `response.iter_content()`), so entries can be handled while the
+    rest is still downloading. Each dict has `title`, `link`, `id`,
+    `summary` (plain text), `published` (None if absent) and
+    `image_url`. Raises ParseError for malformed XML, possibly after some
+    entries have already been yielded.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = _chunks(source, chunk_size)
+    parser = XMLPullParser(events=("start", "end"))
+    parents = []
+    for chunk in source:
+        parser.feed(chunk)
+        yield from _drain(parser, parents)
+    parser.close()
+    yield from _drain(parser, parents)
+
+
+def _drain(parser, parents):
+    for event, element in parser.read_events():
+        if event == "start":
+            parents.append(element)
+            continue
+        parents.pop()
+        if _local_name(element.tag) in ENTRY_TAGS and parents:
+            yield _entry(element)
+            parents[-1].remove(element) # Finished entries are dropped, so the tree never holds the whole feed
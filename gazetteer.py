@@ -0,0 +1,125 @@
+"""Small gazetteer of Andhra Pradesh / Telangana districts and cities.
+
+Maps whatever the user types (English, Telugu, old names) to a place and the
+set of spellings to look for in article text.
+"""
+import re
+
+# name, Telugu name, state, other spellings (English or Telugu)
+PLACES = [
+    # Telangana
+    ("Hyderabad", "హైదరాబాద్", "Telangana", ["హైదరాబాదు", "భాగ్యనగరం", "Bhagyanagar"]),
+    ("Secunderabad", "సికింద్రాబాద్", "Telangana", []),
+    ("Rangareddy", "రంగారెడ్డి", "Telangana", ["Ranga Reddy"]),
+    ("Medchal", "మేడ్చల్", "Telangana", ["Medchal-Malkajgiri", "మల్కాజిగిరి"]),
+    ("Warangal", "వరంగల్", "Telangana", ["వరంగల్లు", "Hanamkonda", "హనుమకొండ"]),
+    ("Karimnagar", "కరీంనగర్", "Telangana", []),
+    ("Nizamabad", "నిజామాబాద్", "Telangana", []),
+    ("Khammam", "ఖమ్మం", "Telangana", []),
+    ("Nalgonda", "నల్గొండ", "Telangana", ["నల్లగొండ", "Nalagonda"]),
+    ("Mahabubnagar", "మహబూబ్‌నగర్", "Telangana", ["మహబూబ్ నగర్", "Mahbubnagar", "Palamuru", "పాలమూరు"]),
+    ("Adilabad", "ఆదిలాబాద్", "Telangana", []),
+    ("Medak", "మెదక్", "Telangana", []),
+    ("Sangareddy", "సంగారెడ్డి", "Telangana", []),
+    ("Siddipet", "సిద్దిపేట", "Telangana", ["సిద్ధిపేట"]),
+    ("Suryapet", "సూర్యాపేట", "Telangana", []),
+    ("Mancherial", "మంచిర్యాల", "Telangana", []),
+    ("Kothagudem", "కొత్తగూడెం", "Telangana", ["Bhadradri Kothagudem", "భద్రాద్రి"]),
+    ("Jagtial", "జగిత్యాల", "Telangana", ["Jagityal"]),
+    ("Kamareddy", "కామారెడ్డి", "Telangana", []),
+    ("Nirmal", "నిర్మల్", "Telangana", []),
+    ("Peddapalli", "పెద్దపల్లి", "Telangana", []),
+    ("Vikarabad", "వికారాబాద్", "Telangana", []),
+    ("Wanaparthy", "వనపర్తి", "Telangana", []),
+    ("Nagarkurnool", "నాగర్‌కర్నూల్", "Telangana", ["నాగర్ కర్నూల్"]),
+    # Andhra Pradesh
+    ("Visakhapatnam", "విశాఖపట్నం", "Andhra Pradesh", ["Vizag", "Vishakhapatnam", "విశాఖ"]),
+    ("Vijayawada", "విజయవాడ", "Andhra Pradesh", ["Bezawada", "బెజవాడ"]),
+    ("Amaravati", "అమరావతి", "Andhra Pradesh", ["Amravati"]),
+    ("Guntur", "గుంటూరు", "Andhra Pradesh", []),
+    ("Nellore", "నెల్లూరు", "Andhra Pradesh", []),
+    ("Kurnool", "కర్నూలు", "Andhra Pradesh", []),
+    ("Tirupati", "తిరుపతి", "Andhra Pradesh", ["Tirumala", "తిరుమల"]),
+    ("Kadapa", "కడప", "Andhra Pradesh", ["Cuddapah", "YSR Kadapa"]),
+    ("Anantapur", "అనంతపురం", "Andhra Pradesh", ["Anantapuramu", "అనంతపురము"]),
+    ("Chittoor", "చిత్తూరు", "Andhra Pradesh", []),
+    ("Rajahmundry", "రాజమహేంద్రవరం", "Andhra Pradesh", ["Rajamahendravaram", "రాజమండ్రి"]),
+    ("Kakinada", "కాకినాడ", "Andhra Pradesh", []),
+    ("Eluru", "ఏలూరు", "Andhra Pradesh", []),
+    ("Ongole", "ఒంగోలు", "Andhra Pradesh", ["Prakasam", "ప్రకాశం"]),
+    ("Srikakulam", "శ్రీకాకుళం", "Andhra Pradesh", []),
+    ("Vizianagaram", "విజయనగరం", "Andhra Pradesh", []),
+    ("Machilipatnam", "మచిలీపట్నం", "Andhra Pradesh", ["Bandar", "Krishna district", "కృష్ణా జిల్లా"]),
+    ("Bhimavaram", "భీమవరం", "Andhra Pradesh", []),
+    ("Narasaraopet", "నరసరావుపేట", "Andhra Pradesh", ["Palnadu", "పల్నాడు"]),
+    ("Nandyal", "నంద్యాల", "Andhra Pradesh", []),
+    ("Bapatla", "బాపట్ల", "Andhra Pradesh", []),
+    ("Puttaparthi", "పుట్టపర్తి", "Andhra Pradesh", ["Sri Sathya Sai"]),
+]
+
+_ZERO_WIDTH = dict.fromkeys(map(ord, "\u200c\u200d"), None) # ZWNJ, ZWJ
+_TELUGU_VIRAMA = "్"
+_TELUGU_VOWEL_SIGNS = {chr(c) for c in range(0x0c3e, 0x0c4d)}
+_TOKEN_RE = re.compile(r"[\w\u0c00-\u0c7f]+") # \w alone splits Telugu words at vowel signs
+MIN_TERM_LENGTH = 3 # The trigram full-text index can't match anything shorter
+
+
+def normalize(text):
+    """Casefolds and drops zero-width joiners, which Telugu text uses inconsistently."""
+    return " ".join((text or "").translate(_ZERO_WIDTH).casefold().split())
+
+
+def tokenize(text):
+    """Splits normalized text into words, keeping Telugu vowel signs and viramas inside words."""
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def stem(term):
+    """Drops a trailing Telugu virama/vowel sign so inflected forms still match.
+
+    e.g. "హైదరాబాద్" -> "హైదరాబాద", which is a substring of "హైదరాబాదులో".
+    """
+    if term and (term[-1] == _TELUGU_VIRAMA or term[-1] in _TELUGU_VOWEL_SIGNS):
+        return term[:-1]
+    return term
+
+
+def _place_dict(name, telugu, state, aliases):
+    return {"name": name, "telugu": telugu, "state": state, "aliases": aliases}
+
+
+_LOOKUP = {}
+for _name, _telugu, _state, _aliases in PLACES:
+    for _spelling in [_name, _telugu] + _aliases:
+        _LOOKUP.setdefault(normalize(_spelling), _place_dict(_name, _telugu, _state, _aliases))
+
+
+def lookup(name):
+    """Returns the place dict whose name or alias is exactly `name` (after normalizing), or None."""
+    return _LOOKUP.get(normalize(name))
+
+
+def resolve(query):
+    """Returns the place dict for a city/district name in English or Telugu, or None."""
+    key = normalize(query)
+    if not key:
+        return None
+    if key in _LOOKUP:
+        return _LOOKUP[key]
+    # Fall back to prefix matches so "vijay" or "హైదరాబాదులో" still resolve
+    for spelling, place in _LOOKUP.items():
+        if len(key) >= MIN_TERM_LENGTH and (spelling.startswith(key) or key.startswith(stem(spelling))):
+            return place
+    return None
+
+
+def search_terms(query):
+    """Returns the normalized spellings to look for in articles about `query`."""
+    place = resolve(query)
+    spellings = [place["name"], place["telugu"]] + place["aliases"] if place else [query]
+    terms = []
+    for spelling in spellings:
+        term = stem(normalize(spelling))
+        if len(term) >= MIN_TERM_LENGTH and term not in terms:
+            terms.append(term)
+    return terms
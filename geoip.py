@@ -0,0 +1,122 @@
+"""Offline visitor location: client IP -> gazetteer place, from a local GeoIP database.
+
+Reads a MaxMind-format city database (e.g. GeoLite2-City.mmdb) through
+memory-mapped I/O with the optional `maxminddb` package, so lookups make no
+network calls. Results are kept in a small per-IP LRU. Without the package
+or the database file every lookup returns None and callers use their default.
+"""
+import ipaddress
+import logging
+import threading
+from collections import OrderedDict
+
+from config import GEOIP_TRUSTED_PROXIES
+from gazetteer import lookup, resolve
+
+logger = logging.getLogger("bharatpulse.geoip")
+
+DEFAULT_CACHE_SIZE = 4096
+# Place used when the database only knows the visitor's state
+STATE_FALLBACK = {"Telangana": "Hyderabad", "Andhra Pradesh": "Vijayawada"}
+
+
+def _public_address(value):
+    try:
+        address = ipaddress.ip_address((value or "").strip())
+    except ValueError:
+        return None
+    return str(address) if address.is_global else None
+
+
+def client_ip(headers, remote_addr=None, trusted_proxies=GEOIP_TRUSTED_PROXIES):
+    """Returns the visitor's public IP, or None if it is private, loopback or unknown.
+
+    Behind `trusted_proxies` reverse proxies the X-Real-IP set by them wins;
+    failing that X-Forwarded-For is read from the right, skipping the hops
+    the proxies appended, since anything further left came from the client
+    and may be forged. Without proxies only `remote_addr` is used.
+    """
+    if trusted_proxies > 0:
+        if headers.get("X-Real-IP"):
+            return _public_address(headers["X-Real-IP"])
+        hops = [hop.strip() for hop in (headers.get("X-Forwarded-For") or "").split(",") if hop.strip()]
+        if len(hops) >= trusted_proxies:
+            return _public_address(hops[-trusted_proxies])
+    return _public_address(remote_addr)
+
+
+def _names(record, key):
+    """English names of a city/subdivision record, most specific first."""
+    if key == "subdivisions":
+        entries = record.get("subdivisions") or []
+    else:
+        entries = [record.get(key) or {}]
+    return [entry.get("names", {}).get("en") for entry in entries if entry.get("names", {}).get("en")]
+
+
+def place_for_record(record):
+    """Maps a GeoIP city record to a gazetteer place dict, or None if it isn't an AP/Telangana place.
+
+    City names must match a gazetteer spelling exactly (and lie in the record's
+    state when it has one): prefix matching would put Amravati, Maharashtra in Amaravati.
+    """
+    if not record or (record.get("country") or {}).get("iso_code") != "IN":
+        return None
+    subdivisions = _names(record, "subdivisions")
+    for name in _names(record, "city"):
+        place = lookup(name)
+        if place and (not subdivisions or place["state"] in subdivisions):
+            return place
+    for state in subdivisions:
+        if state in STATE_FALLBACK:
+            return resolve(STATE_FALLBACK[state])
+    return None
+
+
+class GeoIPLocator:
+    """Looks up client IPs in a memory-mapped GeoIP database with a per-IP LRU in front."""
+
+    def __init__(self, database_path, cache_size=DEFAULT_CACHE_SIZE):
+        self.database_path = database_path
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache = OrderedDict() # ip -> place dict or None, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self._reader = None
+        self.error = None
+        try:
+            import maxminddb
+
+            self._reader = maxminddb.open_database(database_path, mode=maxminddb.MODE_MMAP)
+        except Exception as e: # ImportError without the package, OSError without the file
+            self.error = str(e)
+            logger.warning("GeoIP lookups disabled: %s", e)
+
+    @property
+    def available(self):
+        return self._reader is not None
+
+    def locate(self, ip):
+        """Returns the gazetteer place for `ip`, or None if it's unknown or outside AP/Telangana."""
+        if not ip or self._reader is None:
+            return None
+        with self._lock:
+            if ip in self._cache:
+                self._cache.move_to_end(ip)
+                self.hits += 1
+                return self._cache[ip]
+        try:
+            place = place_for_record(self._reader.get(ip))
+        except ValueError: # Not a valid IP address
+            place = None
+        with self._lock:
+            self.misses += 1
+            self._cache[ip] = place
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return place
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
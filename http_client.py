@@ -0,0 +1,152 @@
+"""Shared HTTP layer for feeds, article pages and the weather API.
+
+One pooled `requests.Session` (keep-alive), a per-host concurrency limit,
+strict connect/read timeouts, and ETag/Last-Modified conditional GETs whose
+bodies are kept on disk so an unchanged feed costs a 304.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from config import HTTP_CACHE_DIR, HTTP_CONNECT_TIMEOUT, HTTP_PER_HOST_LIMIT, HTTP_READ_TIMEOUT
+
+USER_AGENT = "Mozilla/5.0 (compatible; BharatPulse/1.0)"
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+DEFAULT_PER_HOST_LIMIT = HTTP_PER_HOST_LIMIT
+DEFAULT_POOL_SIZE = 16
+
+
+class DomainLimiter:
+    """Caps the number of concurrent requests per host."""
+
+    def __init__(self, limit=DEFAULT_PER_HOST_LIMIT):
+        self._lock = threading.Lock()
+        self._semaphores = defaultdict(lambda: threading.BoundedSemaphore(limit))
+
+    def for_url(self, url):
+        with self._lock:
+            return self._semaphores[urlparse(url).netloc.lower()]
+
+
+class HttpClient:
+    """Pooled, rate-limited HTTP client with an on-disk conditional-GET cache."""
+
+    def __init__(self, cache_dir=None, per_host_limit=DEFAULT_PER_HOST_LIMIT, timeout=DEFAULT_TIMEOUT,
+                 pool_size=DEFAULT_POOL_SIZE):
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._limiter = DomainLimiter(per_host_limit)
+        self._stats_lock = threading.Lock()
+        self.counters = {
+            "requests": 0,
+            "responses_200": 0,
+            "not_modified": 0, # 304s served from the disk cache
+            "errors": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0, # Body bytes we didn't download thanks to a 304
+        }
+
+    def _count(self, **deltas):
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                self.counters[name] += delta
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self.counters)
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        """GET with keep-alive, the per-host limit and a timeout. Raises for HTTP errors."""
+        self._count(requests=1)
+        try:
+            with self._limiter.for_url(url):
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            self._count(errors=1)
+            raise
+        self._count(bytes_downloaded=len(response.content))
+        if response.status_code == 200:
+            self._count(responses_200=1)
+        return response
+
+    def _cache_paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".json"), os.path.join(self.cache_dir, key + ".body")
+
+    def _write_atomic(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get_conditional(self, url, timeout=None):
+        """GETs `url` with If-None-Match/If-Modified-Since and returns `(body_bytes, not_modified)`.
+
+        A 304 returns the body stored on disk from the last 200; without a
+        `cache_dir` this is a plain GET.
+        """
+        if not self.cache_dir:
+            return self.get(url, timeout=timeout).content, False
+
+        meta_path, body_path = self._cache_paths(url)
+        meta = {}
+        if os.path.exists(meta_path) and os.path.exists(body_path):
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and meta:
+            with open(body_path, "rb") as f:
+                body = f.read()
+            self._count(not_modified=1, bytes_saved=len(body))
+            metrics.record_cache("http_conditional", hit=True)
+            return body, True
+        metrics.record_cache("http_conditional", hit=False)
+
+        body = response.content
+        self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "size": len(body),
+        }).encode("utf-8"))
+        return body, False
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def default_client():
+    """Returns the process-wide client configured from config.py."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient(cache_dir=HTTP_CACHE_DIR)
+            metrics.register_collector("http", _default_client.stats)
+        return _default_client
@@ -0,0 +1,197 @@
+"""RSS ingestion: concurrent feed fetching, parsing and newspaper3k enrichment.
+
+Feeds are parsed with the streaming parser in feed_parser.py; feedparser is
+only used for feeds it can't read.
+
+Kept free of Streamlit so it can run outside app.py (and against a local stub
+server, since every URL comes from the caller). All network I/O goes through
+an `http_client.HttpClient`, which owns pooling, per-host limits and timeouts.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from xml.etree.ElementTree import ParseError
+
+import feedparser
+from newspaper import Article # Make sure newspaper3k and lxml_html_clean are installed
+
+import metrics
+from feed_parser import first_image, html_fields, iter_entries
+from http_client import default_client
+
+logger = logging.getLogger("bharatpulse.feeds")
+
+DEFAULT_MAX_WORKERS = 8
+SUMMARY_LENGTH = 200
+
+
+def extract_image_url(entry):
+    """Finds an image for a feed entry from media_content or the description HTML."""
+    with metrics.timer("image_extract"):
+        return _extract_image_url(entry)
+
+
+def _extract_image_url(entry):
+    # Attempt to find image from media_content (common in some RSS feeds)
+    if hasattr(entry, 'media_content') and entry.media_content:
+        for media in entry.media_content:
+            # Check for actual image type
+            if 'url' in media and media.get('type', '').startswith('image'):
+                return media['url']
+    # Attempt to find image from description HTML (common in others)
+    elif hasattr(entry, 'description'):
+        return first_image(entry.description) # First <img> without building a DOM
+    return None
+
+
+def _article(guid, title, link, summary, published, image_url):
+    # Only keep articles with a valid title and link
+    if not title.strip() or link.strip() == "#":
+        return None
+    return {
+        "guid": guid,
+        "title": title,
+        "link": link,
+        "summary": summary,
+        "published": published,
+        "image_url": image_url,
+        "translated_title": None # Placeholder for translation
+    }
+
+
+def stream_entry_to_article(entry):
+    """Converts an entry dict from `feed_parser.iter_entries` into an article dict, or None if it has no title/link."""
+    link = entry["link"] or "#"
+    return _article(entry["id"] or link, entry["title"], link, entry["summary"], entry["published"] or "N/A",
+                    entry["image_url"])
+
+
+def entry_to_article(entry):
+    """Converts a feedparser entry into an article dict, or None if it has no title/link."""
+    title = entry.title if hasattr(entry, 'title') else ""
+    link = entry.link if hasattr(entry, 'link') else "#"
+    summary = html_fields(entry.summary)[0] if hasattr(entry, 'summary') else "" # feedparser keeps sanitized HTML
+    published = entry.published if hasattr(entry, 'published') else "N/A"
+    guid = entry.get('id') or link # Feeds without <guid> are identified by their link
+    return _article(guid, title, link, summary, published, extract_image_url(entry))
+
+
+def needs_enrichment(article):
+    """Whether newspaper3k should be used to fill in a missing image or summary."""
+    link = article["link"]
+    return bool(link and "http" in link and (not article["image_url"] or not article["summary"]))
+
+
+def iter_articles(source):
+    """Yields article dicts from RSS/Atom bytes or byte chunks as each entry is parsed (see `feed_parser.iter_entries`).
+
+    Raises ParseError for malformed XML; use `parse_feed` for the feedparser fallback.
+    """
+    for entry in iter_entries(source):
+        article = stream_entry_to_article(entry)
+        if article:
+            yield article
+
+
+def parse_feed(content, streaming=True):
+    """Parses raw RSS/Atom bytes (or a URL/path) into article dicts, in feed order.
+
+    Bytes are parsed incrementally by feed_parser.py. Feeds it rejects
+    (malformed XML, an encoding expat doesn't know), URLs/paths and
+    `streaming=False` go through feedparser instead.
+    """
+    if streaming and isinstance(content, (bytes, bytearray)):
+        try:
+            with metrics.timer("feed_parse"):
+                return list(iter_articles(content))
+        except (ParseError, ValueError) as e:
+            logger.info("streaming parse failed (%s), falling back to feedparser", e)
+            metrics.inc("feed_parse_fallbacks")
+    with metrics.timer("feed_parse"):
+        feed = feedparser.parse(content)
+    articles = []
+    for entry in feed.entries:
+        article = entry_to_article(entry)
+        if article:
+            articles.append(article)
+    return articles
+
+
+def fetch_feed(url, client=None):
+    """Downloads (with a conditional GET) and parses one feed without enriching its entries."""
+    client = client or default_client()
+    with metrics.timer("feed_fetch"):
+        body, _ = client.get_conditional(url)
+    return parse_feed(body)
+
+
+def enrich_article(article, client=None):
+    """Fills a missing image/summary from the article page using newspaper3k (in place)."""
+    client = client or default_client()
+    try:
+        with metrics.timer("enrich_download"):
+            html = client.get(article["link"]).text
+        with metrics.timer("enrich_parse"):
+            article_parser = Article(article["link"])
+            article_parser.download(input_html=html)
+            article_parser.parse()
+    except Exception as e:
+        # The feed's own title/summary/image are still usable, so the article is kept as-is
+        logger.warning("could not enrich %s: %s", article["link"], e)
+        return article
+    if not article["image_url"] and article_parser.top_image:
+        article["image_url"] = article_parser.top_image
+    if not article["summary"] and article_parser.text: # Use first part of article text if no summary from RSS
+        text = article_parser.text
+        article["summary"] = text[:SUMMARY_LENGTH] + "..." if len(text) > SUMMARY_LENGTH else text
+    return article
+
+
+def enrich_articles(articles, max_workers=DEFAULT_MAX_WORKERS, client=None):
+    """Enriches the articles that need it through a bounded worker pool (in place)."""
+    client = client or default_client()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(enrich_article, a, client) for a in articles if needs_enrichment(a)]
+        for future in futures:
+            future.result()
+    return articles
+
+
+def fetch_all_feeds(feeds, max_workers=DEFAULT_MAX_WORKERS, client=None, enrich=True):
+    """Fetches every feed in parallel and enriches entries through a bounded worker pool.
+
+    `feeds` maps source name -> RSS URL. Returns `(articles_by_source, errors)`:
+    articles keep the order of `feeds` and of entries within each feed, no
+    matter which request finishes first; `errors` maps source name -> message
+    for feeds that could not be fetched.
+    """
+    client = client or default_client()
+    articles_by_source = {name: [] for name in feeds}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as feed_pool, \
+            ThreadPoolExecutor(max_workers=max_workers) as enrich_pool:
+        feed_futures = {feed_pool.submit(fetch_feed, url, client): name for name, url in feeds.items()}
+        enrich_futures = []
+        # Start enriching each feed as soon as it arrives; order is restored by `articles_by_source`
+        for future in as_completed(feed_futures):
+            name = feed_futures[future]
+            try:
+                articles = future.result()
+            except Exception as e:
+                errors[name] = str(e)
+                continue
+            articles_by_source[name] = articles
+            if enrich:
+                enrich_futures.extend(
+                    enrich_pool.submit(enrich_article, a, client) for a in articles if needs_enrichment(a)
+                )
+        for future in enrich_futures:
+            future.result() # enrich_article never raises; this just waits
+    return articles_by_source, errors
+
+
+def get_news_from_rss(url, **kwargs):
+    """Fetches, parses and enriches a single feed. Raises if the feed can't be fetched."""
+    articles_by_source, errors = fetch_all_feeds({url: url}, **kwargs)
+    if url in errors:
+        raise RuntimeError(errors[url])
+    return articles_by_source[url]
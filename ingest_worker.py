@@ -0,0 +1,267 @@
+"""Background ingestion worker for BharatPulse.
+
+Polls RSS_FEEDS, each on its own adaptive schedule (scheduler.py), enriches
+and translates entries it hasn't seen before and writes them to the shared
+article store that app.py reads. Run it next to the Streamlit app:
+
+    python ingest_worker.py               # poll forever
+    python ingest_worker.py --once        # poll every feed once and exit
+"""
+import argparse
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import metrics
+from article_store import ArticleStore
+from config import (
+    ARTICLE_STORE_PATH,
+    DEDUP_MAX_AGE,
+    DEDUP_MAX_ENTRIES,
+    FEED_MAX_CONCURRENT,
+    INGEST_LEASE_SECONDS,
+    INGEST_LEASE_WAIT,
+    INGEST_MAX_WORKERS,
+    INGEST_POLL_INTERVAL,
+    METRICS_HOST,
+    RSS_FEEDS,
+    THUMBNAIL_CACHE_DIR,
+    THUMBNAIL_CACHE_MAX_BYTES,
+    TRANSLATION_BACKEND,
+    TRANSLATION_BATCH_SIZE,
+    TRANSLATION_CACHE_MEMORY_ENTRIES,
+    TRANSLATION_CACHE_PATH,
+    TRANSLATION_PRESET,
+    TRANSLATION_SERVER_URL,
+    TRANSLATION_THREADS,
+    TRENDS_SHOWN,
+    WORKER_METRICS_PORT,
+)
+from classifier import classify_articles
+from dedup import Deduplicator, cluster_articles
+from http_client import default_client
+from ingest import enrich_articles, fetch_all_feeds
+from scheduler import FeedScheduler
+from thumbnails import ThumbnailCache
+from translation import BACKENDS, DECODING_PRESETS, cache_model_name, load_model, translate_articles
+from translation_cache import TranslationCache
+from translation_server import TranslationClient
+from trends import TrendTracker
+
+logger = logging.getLogger("bharatpulse.ingest")
+
+
+def load_deduplicator(store, max_entries=DEDUP_MAX_ENTRIES, max_age=DEDUP_MAX_AGE):
+    """Builds a near-duplicate clusterer seeded with the stories stored in the last `max_age` seconds."""
+    deduplicator = Deduplicator(max_entries=max_entries, max_age=max_age)
+    for guid, fingerprint, source, first_seen in store.recent_fingerprints(max_entries, since=time.time() - max_age):
+        deduplicator.remember(guid, fingerprint, source, first_seen)
+    return deduplicator
+
+
+def load_trend_tracker(store):
+    """Restores the trending-terms tracker saved by the last run (an empty one the first time)."""
+    return TrendTracker.from_state(store.trend_state())
+
+
+@contextmanager
+def ingest_lease(store, wait=INGEST_LEASE_WAIT, seconds=INGEST_LEASE_SECONDS):
+    """Holds the store's "ingest" lease, waiting up to `wait` seconds (None: forever) for it.
+
+    A heartbeat thread renews the lease every third of `seconds`, so it only
+    expires if this process dies or stalls. Yields a function that raises
+    TimeoutError once the lease has been lost to another run.
+    """
+    holder = uuid.uuid4().hex
+    deadline = None if wait is None else time.monotonic() + wait
+    while not store.acquire_lease("ingest", holder, seconds):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError("another ingestion run is still in progress")
+        time.sleep(0.5)
+
+    stop = threading.Event()
+    lost = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(seconds / 3):
+            try:
+                renewed = store.acquire_lease("ingest", holder, seconds)
+            except Exception as e: # E.g. the store is locked; the next beat tries again
+                logger.warning("could not renew the ingest lease: %s", e)
+                continue
+            if not renewed:
+                logger.warning("ingest lease was taken over by another run")
+                lost.set()
+                return
+
+    def check():
+        if lost.is_set():
+            raise TimeoutError("the ingest lease was taken over by another run")
+
+    thread = threading.Thread(target=heartbeat, name="ingest-lease", daemon=True)
+    thread.start()
+    try:
+        yield check
+    finally:
+        stop.set()
+        thread.join()
+        store.release_lease("ingest", holder)
+
+
+def backfill_categories(store):
+    """Classifies articles stored before categories existed."""
+    while True:
+        articles = store.uncategorized()
+        if not articles:
+            return
+        classify_articles(articles)
+        store.set_categories({a["guid"]: a["category"] for a in articles})
+
+
+def ingest_once(store, tokenizer=None, model=None, cache=None, deduplicator=None, thumbnails=None, feeds=RSS_FEEDS,
+                decode_kwargs=None, remote=None, trends=None, on_feed=None, lease_wait=INGEST_LEASE_WAIT):
+    """Runs one fetch -> dedup -> enrich -> translate -> store pass. Returns the number of new articles.
+
+    `decode_kwargs` (generation settings plus `model_name` for cache keys) are passed to the translator;
+    with `remote` (a `TranslationClient`) titles are translated by the shared translation server instead.
+    `trends` defaults to the tracker saved in the store, so the app's per-feed refresh counts towards it too.
+    Waits up to `lease_wait` seconds (None: as long as it takes) for another process's run to finish,
+    then raises TimeoutError; also raises it if the lease was lost before storing.
+    `on_feed(source, articles, new_articles, error)` is called per feed with all its entries, e.g. `FeedScheduler.record`.
+    """
+    started = time.perf_counter()
+    articles_by_source, errors = fetch_all_feeds(feeds, max_workers=INGEST_MAX_WORKERS, enrich=False)
+
+    # From the store lookup to saving trends, runs are serialized across processes: otherwise the app's
+    # refresh and the worker cluster against different snapshots and overwrite each other's trend counts
+    with ingest_lease(store, wait=lease_wait) as check_lease:
+        # Only entries that aren't in the store yet are enriched and translated
+        new_by_source = {}
+        for source, articles in articles_by_source.items():
+            known = store.known(articles)
+            new_by_source[source] = [a for a in articles if a["guid"] not in known]
+        new_articles = [a for articles in new_by_source.values() for a in articles]
+
+        # Near-duplicates of a story another source reported in the last DEDUP_MAX_AGE seconds are stored
+        # as alternates of that story and never reach enrichment or the translation model
+        deduplicator = deduplicator or load_deduplicator(store) # Seeded inside the lease, so it's current
+        with metrics.timer("dedup"):
+            stories = [
+                story for source, articles in new_by_source.items()
+                for story in cluster_articles(articles, deduplicator, source)
+            ]
+        logger.info("%d new entries, %d new stories", len(new_articles), len(stories))
+
+        enrich_articles(stories, max_workers=INGEST_MAX_WORKERS)
+        if thumbnails is not None:
+            # Downscaled card images are made in the background while translation runs
+            thumbnails.prefetch(a["image_url"] for a in stories)
+        try:
+            batch_stats = translate_articles(stories, tokenizer, model, batch_size=TRANSLATION_BATCH_SIZE, cache=cache,
+                                             remote=remote, **(decode_kwargs or {}))
+        except Exception as e:
+            # Shared server busy or down: store the titles untranslated; the app translates them later
+            logger.warning("translation server unavailable: %s", e)
+            batch_stats = []
+        for stats in batch_stats:
+            logger.info("translation batch %(batch)d: %(size)d titles, max %(max_tokens)d tokens, %(seconds).3fs",
+                        stats)
+        with metrics.timer("classify"):
+            classify_articles(new_articles)
+
+        check_lease() # Don't write stories another run may have stored meanwhile
+        total_new = 0
+        for source, articles in new_by_source.items():
+            if source in errors:
+                logger.warning("failed to fetch %s: %s", source, errors[source])
+                store.record_feed_status(source, error=errors[source])
+                if on_feed is not None:
+                    on_feed(source, error=errors[source])
+                continue
+            added = store.add_articles(source, articles)
+            store.record_feed_status(source, new_articles=added)
+            if on_feed is not None:
+                on_feed(source, articles=articles_by_source[source], new_articles=added)
+            total_new += added
+
+        # Every new entry counts, near-duplicates included: several sources carrying a story is what trending means
+        with metrics.timer("trends"):
+            trends = trends or load_trend_tracker(store)
+            trends.add(new_articles)
+            store.save_trends(trends.state(), trends.trending(TRENDS_SHOWN))
+    seconds = time.perf_counter() - started
+    metrics.observe("ingest_run", seconds)
+    metrics.inc("articles_ingested", total_new)
+    logger.info("ingested %d new articles in %.1fs; http %s", total_new, seconds, default_client().stats())
+    return total_new
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll RSS feeds into the BharatPulse article store.")
+    parser.add_argument("--once", action="store_true", help="poll every feed once and exit")
+    parser.add_argument("--interval", type=float, default=INGEST_POLL_INTERVAL,
+                        help="starting poll interval per feed, adapted from its publish cadence (default: %(default)s)")
+    parser.add_argument("--max-concurrent", type=int, default=FEED_MAX_CONCURRENT,
+                        help="feeds polled at once (default: %(default)s)")
+    parser.add_argument("--no-translate", action="store_true", help="store articles without loading the model")
+    parser.add_argument("--backend", choices=BACKENDS, default=TRANSLATION_BACKEND,
+                        help="translation inference backend (default: %(default)s)")
+    parser.add_argument("--preset", choices=sorted(DECODING_PRESETS), default=TRANSLATION_PRESET,
+                        help="translation decoding preset (default: %(default)s)")
+    parser.add_argument("--threads", type=int, default=TRANSLATION_THREADS,
+                        help="CPU threads for translation (default: library default)")
+    parser.add_argument("--translation-server", default=TRANSLATION_SERVER_URL,
+                        help="URL of translation_server.py to use instead of loading a model here")
+    parser.add_argument("--metrics-port", type=int, default=WORKER_METRICS_PORT,
+                        help="serve Prometheus metrics on this port (0 to disable; default: %(default)s)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    store = ArticleStore(ARTICLE_STORE_PATH)
+    cache = TranslationCache(TRANSLATION_CACHE_PATH, max_memory_entries=TRANSLATION_CACHE_MEMORY_ENTRIES)
+    thumbnails = ThumbnailCache(THUMBNAIL_CACHE_DIR, max_bytes=THUMBNAIL_CACHE_MAX_BYTES)
+    metrics.register_collector("translation_cache", cache.stats)
+    metrics.register_collector("thumbnails", thumbnails.stats)
+    if args.metrics_port:
+        metrics.start_http_server(args.metrics_port, host=METRICS_HOST)
+    tokenizer = model = remote = None
+    if args.translation_server and not args.no_translate:
+        remote = TranslationClient(args.translation_server)
+    elif not args.no_translate:
+        try:
+            tokenizer, model = load_model(backend=args.backend, num_threads=args.threads)
+        except Exception:
+            logger.exception("could not load translation model; only cached translations will be used")
+    decode_kwargs = dict(DECODING_PRESETS[args.preset], model_name=cache_model_name(backend=args.backend))
+
+    scheduler = FeedScheduler(RSS_FEEDS, base_interval=args.interval, max_concurrent=args.max_concurrent)
+    if not args.once:
+        scheduler.restore(store.feed_status()) # Keep learnt cadences and backoffs across restarts
+    metrics.register_collector("scheduler", scheduler.stats)
+
+    backfill_categories(store)
+    while True:
+        due = list(RSS_FEEDS) if args.once else scheduler.due()
+        if due:
+            try:
+                # The deduplicator and trend tracker are reloaded from the store inside the ingest lease,
+                # so stories merged by the app's per-feed refresh are clustered against and counted too
+                ingest_once(store, tokenizer, model, cache, thumbnails=thumbnails, decode_kwargs=decode_kwargs,
+                            remote=remote, feeds={name: RSS_FEEDS[name] for name in due}, on_feed=scheduler.record,
+                            lease_wait=None)
+            except Exception as e:
+                logger.exception("ingestion run failed")
+                for name in due:
+                    if scheduler.feeds[name].next_poll <= time.time(): # Not rescheduled by on_feed
+                        scheduler.record(name, error=str(e))
+            for name in due:
+                store.record_feed_schedule(name, scheduler.status(name))
+        if args.once:
+            break
+        time.sleep(max(1.0, scheduler.seconds_until_next()))
+
+
+if __name__ == "__main__":
+    main()
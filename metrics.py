@@ -0,0 +1,188 @@
+"""Process-wide stage timers and counters, exported in the Prometheus text format.
+
+Recording is a `perf_counter` call and a few integer updates under a lock,
+so it stays on in production. Each process (the Streamlit app, the ingestion
+worker) keeps its own numbers and can serve them with `start_http_server`:
+
+    with metrics.timer("feed_parse"):
+        feed = feedparser.parse(content)
+    metrics.record_cache("translation", hit=True)
+"""
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("bharatpulse.metrics")
+
+PREFIX = "bharatpulse"
+# Upper bounds (seconds) of the stage latency histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Stage:
+    __slots__ = ("count", "total", "max", "errors", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.buckets = [0] * len(BUCKETS) # Non-cumulative; summed up on export
+
+
+class Metrics:
+    """Stage latencies (count, sum, max, histogram), stage errors, cache hits/misses and named counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._caches = {} # (cache, "hit" | "miss") -> count
+        self._counters = {}
+        self._collectors = {} # name -> callable returning {key: number}, read at export time
+
+    def observe(self, stage, seconds, error=False):
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = _Stage()
+            entry.count += 1
+            entry.total += seconds
+            entry.max = max(entry.max, seconds)
+            if index < len(BUCKETS):
+                entry.buckets[index] += 1
+            if error:
+                entry.errors += 1
+
+    @contextmanager
+    def timer(self, stage):
+        """Times the block as `stage`; an exception escaping it is also counted as a stage error."""
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.observe(stage, time.perf_counter() - started, error=True)
+            raise
+        self.observe(stage, time.perf_counter() - started)
+
+    def record_error(self, stage):
+        """Counts a failure of `stage` that was handled rather than raised."""
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = _Stage()
+            entry.errors += 1
+
+    def record_cache(self, cache, hit, amount=1):
+        if amount:
+            key = (cache, "hit" if hit else "miss")
+            with self._lock:
+                self._caches[key] = self._caches.get(key, 0) + amount
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def register_collector(self, name, collect):
+        """Exports `collect()` (a dict of numbers, e.g. a `stats()` method) as `bharatpulse_<name>_<key>` gauges."""
+        with self._lock:
+            self._collectors[name] = collect
+
+    def snapshot(self):
+        """Plain-dict copy of everything recorded so far (for the admin panel)."""
+        with self._lock:
+            stages = {
+                stage: {"count": s.count, "total_seconds": s.total, "max_seconds": s.max, "errors": s.errors}
+                for stage, s in self._stages.items()
+            }
+            caches = dict(self._caches)
+            counters = dict(self._counters)
+            collectors = dict(self._collectors)
+        collected = {}
+        for name, collect in collectors.items():
+            try:
+                collected[name] = dict(collect())
+            except Exception as e:
+                logger.debug("metrics collector %s failed: %s", name, e)
+        return {"stages": stages, "caches": caches, "counters": counters, "collected": collected}
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            stages = {stage: (s.count, s.total, s.errors, list(s.buckets)) for stage, s in self._stages.items()}
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {PREFIX}_stage_seconds Time spent per pipeline stage.",
+            f"# TYPE {PREFIX}_stage_seconds histogram",
+        ]
+        for stage, (count, total, _, buckets) in sorted(stages.items()):
+            cumulative = 0
+            for bound, in_bucket in zip(BUCKETS, buckets):
+                cumulative += in_bucket
+                lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{PREFIX}_stage_seconds_count{{stage="{stage}"}} {count}')
+        lines += [f"# HELP {PREFIX}_stage_errors_total Failures per pipeline stage.",
+                  f"# TYPE {PREFIX}_stage_errors_total counter"]
+        for stage, (_, _, errors, _) in sorted(stages.items()):
+            lines.append(f'{PREFIX}_stage_errors_total{{stage="{stage}"}} {errors}')
+        lines += [f"# HELP {PREFIX}_cache_requests_total Cache lookups by cache and result.",
+                  f"# TYPE {PREFIX}_cache_requests_total counter"]
+        for (cache, result), count in sorted(snapshot["caches"].items()):
+            lines.append(f'{PREFIX}_cache_requests_total{{cache="{cache}",result="{result}"}} {count}')
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+            lines.append(f"{PREFIX}_{name}_total {value}")
+        for collector, values in sorted(snapshot["collected"].items()):
+            for key, value in sorted(values.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f"# TYPE {PREFIX}_{collector}_{key} gauge")
+                    lines.append(f"{PREFIX}_{collector}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Metrics()
+
+# Module-level shortcuts for the process-wide registry
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+record_error = REGISTRY.record_error
+record_cache = REGISTRY.record_cache
+inc = REGISTRY.inc
+register_collector = REGISTRY.register_collector
+snapshot = REGISTRY.snapshot
+render_prometheus = REGISTRY.render_prometheus
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Scrapes would otherwise flood stderr
+
+
+def start_http_server(port, host="127.0.0.1", registry=REGISTRY):
+    """Serves `GET /metrics` on a daemon thread and returns the server (None if the port is taken)."""
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning("metrics endpoint not started on %s:%d: %s", host, port, e)
+        return None
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics").start()
+    logger.info("metrics at http://%s:%d/metrics", host, port)
+    return server
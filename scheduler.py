@@ -0,0 +1,182 @@
+"""Adaptive per-feed polling for ingest_worker.py.
+
+Each feed gets its own next-poll time instead of one interval for all:
+- The publish cadence is learnt from the timestamps of each feed's entries.
+  A feed posting every few minutes is polled a few times per post; one that
+  posts twice a day is left alone. Feeds without usable timestamps speed up
+  when a poll finds new entries and slow down when it doesn't.
+- A feed that fails backs off exponentially, with jitter so retries don't
+  line up, up to FEED_BACKOFF_MAX seconds. The first success resets it.
+- At most `max_concurrent` feeds are polled at once, most overdue first;
+  the rest wait for the next round.
+
+`stats()` and `status()` report each feed's health for metrics and the app.
+"""
+import logging
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from config import (
+    FEED_BACKOFF_MAX,
+    FEED_CADENCE_FACTOR,
+    FEED_MAX_CONCURRENT,
+    FEED_MAX_INTERVAL,
+    FEED_MIN_INTERVAL,
+    INGEST_POLL_INTERVAL,
+)
+
+logger = logging.getLogger("bharatpulse.scheduler")
+
+CADENCE_SAMPLE = 20 # Newest entries whose timestamps are used to estimate a feed's cadence
+CADENCE_SMOOTHING = 0.5 # Weight of the latest estimate against the running one
+YIELD_STEP = 1.25 # Interval change per poll for feeds without timestamps
+SUCCESS_JITTER = 0.1 # +/- share of the interval, so feeds polled together drift apart
+
+
+def parse_published(value):
+    """Parses an RSS (RFC 822) or Atom (ISO 8601) date into a UTC timestamp, or None."""
+    if not value or value == "N/A":
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def publish_cadence(articles, sample=CADENCE_SAMPLE):
+    """Median seconds between consecutive entries among the newest `sample`, or None if it can't be told."""
+    stamps = sorted({t for t in map(parse_published, (a.get("published") for a in articles)) if t}, reverse=True)
+    gaps = [newer - older for newer, older in zip(stamps[:sample], stamps[1:sample])]
+    return statistics.median(gaps) if gaps else None
+
+
+class FeedState:
+    """Polling schedule and health of one feed."""
+
+    def __init__(self, name, url, interval):
+        self.name = name
+        self.url = url
+        self.interval = interval # Seconds between polls while the feed is healthy
+        self.next_poll = 0.0 # Wall-clock time; 0 means poll right away
+        self.cadence = None # Learnt seconds between published entries
+        self.consecutive_failures = 0
+        self.polls = 0
+        self.failures = 0
+        self.new_articles = 0
+        self.last_new = 0
+        self.last_success = None
+        self.last_error = None
+
+    def status(self):
+        return {
+            "poll_interval": self.interval,
+            "next_poll": self.next_poll,
+            "cadence_seconds": self.cadence,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class FeedScheduler:
+    """Decides which feeds are due and when to poll each one next."""
+
+    def __init__(self, feeds, base_interval=INGEST_POLL_INTERVAL, min_interval=FEED_MIN_INTERVAL,
+                 max_interval=FEED_MAX_INTERVAL, backoff_max=FEED_BACKOFF_MAX, cadence_factor=FEED_CADENCE_FACTOR,
+                 max_concurrent=FEED_MAX_CONCURRENT, rng=None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_max = backoff_max
+        self.cadence_factor = cadence_factor
+        self.max_concurrent = max_concurrent
+        self._random = rng or random.Random()
+        self.feeds = {name: FeedState(name, url, self._clamp(base_interval)) for name, url in feeds.items()}
+
+    def _clamp(self, seconds):
+        return min(self.max_interval, max(self.min_interval, seconds))
+
+    def restore(self, feed_status):
+        """Resumes schedules saved in the article store (`ArticleStore.feed_status()`) by a previous run."""
+        for name, saved in feed_status.items():
+            feed = self.feeds.get(name)
+            if feed is None:
+                continue
+            if saved.get("poll_interval"):
+                feed.interval = self._clamp(saved["poll_interval"])
+            feed.next_poll = saved.get("next_poll") or 0.0
+            feed.cadence = saved.get("cadence_seconds")
+            feed.consecutive_failures = saved.get("consecutive_failures") or 0
+            feed.last_success = saved.get("last_success")
+            feed.last_error = saved.get("last_error")
+
+    def due(self, now=None):
+        """Names of the feeds to poll now: overdue ones, most overdue first, within the concurrency budget."""
+        now = time.time() if now is None else now
+        overdue = sorted((f for f in self.feeds.values() if f.next_poll <= now), key=lambda f: f.next_poll)
+        return [f.name for f in overdue[:self.max_concurrent]]
+
+    def seconds_until_next(self, now=None):
+        """How long the worker can sleep before some feed is due."""
+        now = time.time() if now is None else now
+        return max(0.0, min(f.next_poll for f in self.feeds.values()) - now)
+
+    def record(self, name, articles=(), new_articles=0, error=None, now=None):
+        """Updates a feed's schedule after a poll: `articles` are all its entries, `new_articles` how many were new."""
+        now = time.time() if now is None else now
+        feed = self.feeds[name]
+        feed.polls += 1
+        if error is not None:
+            feed.failures += 1
+            feed.consecutive_failures += 1
+            feed.last_error = error
+            # Exponential backoff with "equal jitter": half the delay is fixed, the other half random
+            delay = min(self.backoff_max, feed.interval * 2 ** feed.consecutive_failures)
+            feed.next_poll = now + delay / 2 + self._random.uniform(0, delay / 2)
+            logger.warning("%s failed %d time(s) in a row; retrying in %.0fs: %s", name,
+                           feed.consecutive_failures, feed.next_poll - now, error)
+            return
+
+        feed.consecutive_failures = 0
+        feed.last_error = None
+        feed.last_success = now
+        feed.last_new = new_articles
+        feed.new_articles += new_articles
+        cadence = publish_cadence(articles)
+        if cadence is not None:
+            feed.cadence = cadence if feed.cadence is None else (
+                CADENCE_SMOOTHING * cadence + (1 - CADENCE_SMOOTHING) * feed.cadence
+            )
+        if feed.cadence is not None:
+            feed.interval = self._clamp(feed.cadence * self.cadence_factor)
+        else:
+            feed.interval = self._clamp(feed.interval / YIELD_STEP if new_articles else feed.interval * YIELD_STEP)
+        feed.next_poll = now + feed.interval * (1 + self._random.uniform(-SUCCESS_JITTER, SUCCESS_JITTER))
+        logger.info("%s: %d new; cadence %s, next poll in %.0fs", name, new_articles,
+                    f"{feed.cadence:.0f}s" if feed.cadence is not None else "unknown", feed.next_poll - now)
+
+    def status(self, name):
+        """Schedule fields saved with the feed's status in the article store."""
+        return self.feeds[name].status()
+
+    def stats(self):
+        """Flat per-feed health numbers for metrics.register_collector."""
+        now = time.time()
+        stats = {"feeds": len(self.feeds), "failing": sum(1 for f in self.feeds.values() if f.consecutive_failures)}
+        for feed in self.feeds.values():
+            prefix = "".join(c if c.isalnum() else "_" for c in feed.name.lower())
+            stats[f"{prefix}_interval_seconds"] = feed.interval
+            stats[f"{prefix}_next_poll_seconds"] = max(0.0, feed.next_poll - now)
+            stats[f"{prefix}_consecutive_failures"] = feed.consecutive_failures
+            stats[f"{prefix}_polls"] = feed.polls
+            stats[f"{prefix}_failures"] = feed.failures
+            stats[f"{prefix}_new_articles"] = feed.new_articles
+            if feed.cadence is not None:
+                stats[f"{prefix}_cadence_seconds"] = feed.cadence
+        return stats
@@ -0,0 +1,202 @@
+"""Card-sized thumbnails for news images, kept in a size-bounded on-disk LRU.
+
+Publisher images are often multi-megabyte originals that the card CSS shows
+200px high. Each image is fetched once through the shared HTTP client,
+downscaled, re-encoded as WebP (JPEG if this Pillow build lacks WebP) and
+served from disk afterwards.
+"""
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from config import THUMBNAIL_ERROR_SECONDS
+
+logger = logging.getLogger("bharatpulse.thumbnails")
+
+THUMBNAIL_SIZE = (480, 270) # Fits a 200px-high card on high-DPI screens
+THUMBNAIL_QUALITY = 75
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+MAX_REMEMBERED_FAILURES = 4096 # Least recently failed URLs are forgotten past this
+
+
+class ThumbnailError(Exception):
+    """The image couldn't be fetched or decoded recently; not retried until `error_seconds` pass."""
+
+
+class ThumbnailCache:
+    """Fetches, downscales and stores thumbnails; evicts least recently used files past `max_bytes`.
+
+    Failed downloads and undecodable images are remembered for `error_seconds`,
+    so a broken image URL isn't fetched (and timed out on) again on every rerun.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, client=None, prefetch_workers=4,
+                 error_seconds=THUMBNAIL_ERROR_SECONDS):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.client = client
+        self.error_seconds = error_seconds
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._evicting = False
+        self._failures = OrderedDict() # url -> (failed at, message), least recently failed first
+        self._executor = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="thumbnails")
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        """(path, size, last_used) for every stored thumbnail."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith((".webp", ".jpg")):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _path_for(self, url, extension):
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + extension)
+
+    def cached_path(self, url):
+        """Returns the stored thumbnail for `url` (marking it recently used), or None. Never does I/O over the network."""
+        for extension in (".webp", ".jpg"):
+            path = self._path_for(url, extension)
+            try:
+                os.utime(path) # mtime doubles as the LRU timestamp
+                return path
+            except FileNotFoundError:
+                continue
+        return None
+
+    def recent_failure(self, url):
+        """The error message if `url` failed within the last `error_seconds`, else None."""
+        with self._lock:
+            failure = self._failures.get(url)
+            if failure is None:
+                return None
+            if time.time() - failure[0] >= self.error_seconds:
+                del self._failures[url]
+                return None
+            return failure[1]
+
+    def get(self, url):
+        """Returns a thumbnail path for `url`, fetching and downscaling it if needed.
+
+        Raises on failure, and raises ThumbnailError without retrying while an
+        earlier failure for `url` is remembered.
+        """
+        path = self.cached_path(url)
+        if path:
+            return path
+        failure = self.recent_failure(url)
+        if failure is not None:
+            raise ThumbnailError(failure)
+        try:
+            thumbnail, extension = self._fetch(url)
+        except Exception as e:
+            with self._lock:
+                self._failures[url] = (time.time(), str(e))
+                self._failures.move_to_end(url)
+                while len(self._failures) > MAX_REMEMBERED_FAILURES:
+                    self._failures.popitem(last=False)
+            raise
+        path = self._path_for(url, extension)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(thumbnail)
+        with self._lock:
+            # Another thread may have stored the same URL meanwhile; count only the change in size
+            try:
+                replaced = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+            self._total_bytes += len(thumbnail) - replaced
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self._evict()
+        return path
+
+    def _fetch(self, url):
+        from http_client import default_client # Imports requests; deferred so importing this module stays light
+
+        client = self.client or default_client()
+        with metrics.timer("thumbnail_download"):
+            data = client.get(url).content
+        with metrics.timer("thumbnail_downscale"):
+            return _downscale(data)
+
+    def prefetch(self, urls):
+        """Creates missing thumbnails on background threads."""
+        for url in urls:
+            if not url or self.cached_path(url) or self.recent_failure(url):
+                continue
+            with self._lock:
+                if url in self._pending:
+                    continue
+                self._pending.add(url)
+            self._executor.submit(self._prefetch_one, url)
+
+    def _prefetch_one(self, url):
+        try:
+            self.get(url)
+        except Exception as e:
+            logger.debug("thumbnail for %s failed: %s", url, e)
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+
+    def _evict(self):
+        # Drop least recently used files until we're back under 90% of the budget
+        with self._lock:
+            if self._evicting:
+                return # Another thread is already evicting
+            self._evicting = True
+        try:
+            target = self.max_bytes * 0.9
+            for path, _, _ in sorted(self._entries(), key=lambda entry: entry[2]):
+                with self._lock:
+                    # Stat and remove under the lock so a concurrent `get` replacing this file is counted once
+                    if self._total_bytes <= target:
+                        break
+                    try:
+                        size = os.stat(path).st_size
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                    self._total_bytes -= size
+        finally:
+            with self._lock:
+                self._evicting = False
+
+    def stats(self):
+        with self._lock:
+            return {"bytes": self._total_bytes, "max_bytes": self.max_bytes, "pending": len(self._pending),
+                    "failed": len(self._failures)}
+
+
+def _downscale(data):
+    """Returns `(encoded_bytes, extension)` for a card-sized version of the image in `data`."""
+    from PIL import Image, features
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft("RGB", THUMBNAIL_SIZE) # Lets JPEG decoding skip most of the full-size pixels
+        image = image.convert("RGB")
+        image.thumbnail(THUMBNAIL_SIZE)
+        out = io.BytesIO()
+        if features.check("webp"):
+            image.save(out, "WEBP", quality=THUMBNAIL_QUALITY, method=4)
+            return out.getvalue(), ".webp"
+        image.save(out, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
+        return out.getvalue(), ".jpg"
@@ -0,0 +1,341 @@
+"""Batched English -> Telugu headline translation with IndicTrans2.
+
+Kept free of Streamlit so the same code can be reused outside app.py.
+torch and transformers are imported only when a model is actually loaded or
+run, so importing this module is cheap.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from config import TRANSLATION_ONNX_DIR
+from translation_cache import make_cache_key
+
+logger = logging.getLogger("bharatpulse.translation")
+
+MODEL_NAME = "ai4bharat/indictrans2-en-indic-dist-200M" # A distilled version (200M parameters)
+TARGET_LANG_TAG = "<2te>" # IndicTrans2 'dist' models expect `<2te> English_Sentence` for EN->TE
+
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_MAX_NEW_TOKENS = 128
+DEFAULT_NUM_BEAMS = 5
+
+# Inference backends:
+#   "torch" - full-precision PyTorch model (on GPU if available)
+#   "int8"  - PyTorch with dynamic int8 quantization of the Linear layers (CPU only)
+#   "onnx"  - ONNX Runtime through optimum (needs `pip install optimum[onnxruntime]`). The model is
+#             exported once into TRANSLATION_ONNX_DIR and loaded from there afterwards. IndicTrans2 is a
+#             custom (trust_remote_code) architecture without a built-in optimum export config, so the
+#             export can fail; load_model then logs a warning and uses "torch" instead.
+BACKENDS = ("torch", "int8", "onnx")
+DEFAULT_BACKEND = "torch"
+
+# Decoding presets: name -> generation settings. Headlines are short, so 64 new tokens is plenty
+# outside "quality", which keeps the original settings (and therefore the original cache keys).
+DECODING_PRESETS = {
+    "quality": {"max_new_tokens": DEFAULT_MAX_NEW_TOKENS, "num_beams": DEFAULT_NUM_BEAMS},
+    "balanced": {"max_new_tokens": 64, "num_beams": 2},
+    "fast": {"max_new_tokens": 64, "num_beams": 1}, # Greedy
+}
+DEFAULT_PRESET = "quality"
+
+
+def load_model(model_name=MODEL_NAME, backend=DEFAULT_BACKEND, num_threads=None):
+    """Loads the IndicTrans2 English to Telugu tokenizer and model for `backend` (see BACKENDS).
+
+    The 'trust_remote_code=True' is essential for this model, and 'sentencepiece'
+    must be installed. `num_threads` caps the CPU threads used for inference
+    (None keeps the library default). Raises if the model can't be loaded.
+    """
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown translation backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=True)
+    if backend == "onnx":
+        try:
+            return tokenizer, _load_onnx(model_name, num_threads)
+        except Exception as e:
+            logger.warning("ONNX backend unavailable for %s (%s); falling back to torch", model_name, e)
+            backend = "torch"
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name, trust_remote_code=True)
+    model.eval()
+    if backend == "int8":
+        # Weights of every Linear layer are stored as int8; activations are quantized on the fly
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif torch.cuda.is_available():
+        model.to("cuda")
+    return tokenizer, model
+
+
+def _load_onnx(model_name, num_threads=None, export_dir=TRANSLATION_ONNX_DIR):
+    """Loads the ONNX Runtime model from `export_dir`, exporting it there first if this is the first run."""
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    options = onnxruntime.SessionOptions()
+    if num_threads:
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+    path = os.path.join(export_dir, model_name.replace("/", "--"))
+    if not os.path.exists(os.path.join(path, "config.json")):
+        logger.info("exporting %s to ONNX in %s (first run only)", model_name, path)
+        os.makedirs(export_dir, exist_ok=True)
+        exported = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, trust_remote_code=True)
+        # Saved under a temporary name and renamed, so a crash never leaves a half-written export behind
+        tmp_path = tempfile.mkdtemp(dir=export_dir)
+        exported.save_pretrained(tmp_path)
+        try:
+            os.rename(tmp_path, path)
+        except OSError: # Another process finished its export first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    return ORTModelForSeq2SeqLM.from_pretrained(path, trust_remote_code=True, session_options=options)
+
+
+def cache_model_name(model_name=MODEL_NAME, backend=DEFAULT_BACKEND):
+    """Model identity used in cache keys: quantized and ONNX outputs can differ from full precision."""
+    return model_name if backend == "torch" else f"{model_name}+{backend}"
+
+
+def needs_translation(text):
+    """Simple heuristic: translate only if the text has ASCII letters.
+
+    This prevents trying to translate already Telugu titles or titles with mixed scripts.
+    """
+    return any(char.isalpha() and char.isascii() for char in text or "")
+
+
+def decode_settings(max_new_tokens=DEFAULT_MAX_NEW_TOKENS, num_beams=DEFAULT_NUM_BEAMS):
+    """The generation settings that, together with the model, determine a translation."""
+    return {"max_new_tokens": max_new_tokens, "num_beams": num_beams, "early_stopping": True}
+
+
+def translate_batch(texts, tokenizer, model, batch_size=DEFAULT_BATCH_SIZE,
+                    max_new_tokens=DEFAULT_MAX_NEW_TOKENS, num_beams=DEFAULT_NUM_BEAMS,
+                    cache=None, model_name=MODEL_NAME):
+    """Translates a list of English texts to Telugu in fixed-size batches.
+
+    Duplicate texts are translated once, and inputs are sorted by token length
+    before batching so each `generate` call pads as little as possible. With a
+    `TranslationCache`, cached texts skip the model entirely and new results are
+    written back. Returns `(translations, batch_stats)` where `translations`
+    lines up with `texts` and `batch_stats` holds one dict per `generate` call.
+    Texts whose batch failed come back as None, so callers store nothing and retry them later.
+    """
+    translations = ["" for _ in texts]
+    unique_texts = list(dict.fromkeys(t.strip() for t in texts if t and t.strip()))
+    if not unique_texts:
+        return translations, []
+
+    results = {}
+    keys = {}
+    if cache is not None:
+        settings = decode_settings(max_new_tokens, num_beams)
+        keys = {t: make_cache_key(t, model_name, settings) for t in unique_texts}
+        cached = cache.get_many(list(keys.values()))
+        results = {t: cached[k] for t, k in keys.items() if k in cached}
+    pending = [t for t in unique_texts if t not in results]
+
+    batch_stats = []
+    if pending and (tokenizer is None or model is None):
+        for text in pending:
+            results[text] = None
+        pending = []
+    if pending:
+        import torch
+
+        tagged = [f"{TARGET_LANG_TAG} {t}" for t in pending]
+        # One cheap tokenizer pass (no padding, no tensors) just to get lengths for bucketing
+        lengths = [len(ids) for ids in tokenizer(tagged, truncation=True)["input_ids"]]
+        order = sorted(range(len(pending)), key=lambda i: lengths[i])
+        device = model.device # Also defined for ONNX Runtime models, which have no parameters()
+
+        fresh = {}
+        for start in range(0, len(order), batch_size):
+            batch_idx = order[start:start + batch_size]
+            batch_inputs = [tagged[i] for i in batch_idx]
+            started = time.perf_counter()
+            try:
+                inputs = tokenizer(batch_inputs, return_tensors="pt", padding=True, truncation=True)
+                inputs = {k: v.to(device) for k, v in inputs.items()}
+                with torch.inference_mode():
+                    translated_tokens = model.generate(**inputs, max_new_tokens=max_new_tokens,
+                                                       num_beams=num_beams, early_stopping=True)
+                decoded = tokenizer.batch_decode(translated_tokens, skip_special_tokens=True)
+                # Remove any lingering target language tags if present in output
+                decoded = [d.replace(TARGET_LANG_TAG, "").strip() for d in decoded]
+                for i, text in zip(batch_idx, decoded):
+                    fresh[pending[i]] = text
+                error = None
+            except Exception as e:
+                decoded = [None] * len(batch_idx)
+                error = str(e)
+            for i, text in zip(batch_idx, decoded):
+                results[pending[i]] = text
+            seconds = time.perf_counter() - started
+            metrics.observe("translate_generate", seconds, error=error is not None)
+            batch_stats.append({
+                "batch": len(batch_stats),
+                "size": len(batch_idx),
+                "max_tokens": max(lengths[i] for i in batch_idx),
+                "seconds": seconds,
+                "error": error,
+            })
+        if cache is not None:
+            # Failures are not cached so they are retried on the next run
+            cache.set_many({keys[t]: v for t, v in fresh.items()})
+
+    for pos, text in enumerate(texts):
+        if text and text.strip():
+            translations[pos] = results[text.strip()]
+    return translations, batch_stats
+
+
+def translate_articles(articles, tokenizer, model, batch_size=DEFAULT_BATCH_SIZE, cache=None, remote=None,
+                       **decode_kwargs):
+    """Fills `translated_title` on every article dict in place.
+
+    English-bearing titles go through one batched, deduplicated (and, with
+    `cache`, cached) translation pass; everything else keeps its original
+    title. Titles that can't be translated get `None`. Returns the per-batch stats.
+    With `remote` (a `translation_server.TranslationClient`) the titles are sent
+    to the shared server instead, which batches and caches them itself; its
+    errors are raised.
+    """
+    to_translate = [a for a in articles if needs_translation(a["title"])]
+    for article in articles:
+        if not needs_translation(article["title"]):
+            article["translated_title"] = article["title"] # Assume it's already Telugu or mixed
+
+    if not to_translate:
+        return []
+
+    titles = [a["title"] for a in to_translate]
+    if remote is not None:
+        translations, batch_stats = remote.translate(titles), []
+    else:
+        translations, batch_stats = translate_batch(
+            titles, tokenizer, model, batch_size=batch_size, cache=cache, **decode_kwargs
+        )
+    for article, translated in zip(to_translate, translations):
+        article["translated_title"] = translated
+    return batch_stats
+
+
+class BackgroundTranslator:
+    """Loads the model on a background thread and translates titles off the render path.
+
+    Work runs on a single worker thread: loading (plus one warm-up `generate`)
+    is queued first, so translation jobs submitted before the model is ready
+    simply wait behind it. `on_translated` receives `{guid: translated_title}`.
+    With `remote` (a `translation_server.TranslationClient`) no model is loaded
+    here: "loading" waits for the shared server and titles are sent to it.
+    """
+
+    WARMUP_TEXT = "Heavy rains lash Hyderabad"
+
+    def __init__(self, cache=None, batch_size=DEFAULT_BATCH_SIZE, on_translated=None,
+                 backend=DEFAULT_BACKEND, num_threads=None, preset=DEFAULT_PRESET, remote=None):
+        self.cache = cache
+        self.batch_size = batch_size
+        self.on_translated = on_translated
+        self.backend = backend
+        self.num_threads = num_threads
+        self.decode_kwargs = dict(DECODING_PRESETS[preset], model_name=cache_model_name(backend=backend))
+        self.remote = remote
+        self.tokenizer = None
+        self.model = None
+        self.error = None
+        self.load_seconds = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._failed = set() # Titles the model couldn't translate aren't retried by this process
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translator")
+
+    def start(self):
+        self._executor.submit(self._load)
+        return self
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            if self.remote is not None:
+                self.remote.wait_ready()
+            else:
+                self.tokenizer, self.model = load_model(backend=self.backend, num_threads=self.num_threads)
+                translate_batch([self.WARMUP_TEXT], self.tokenizer, self.model, batch_size=1, **self.decode_kwargs)
+        except Exception as e:
+            self.error = str(e)
+        self.load_seconds = time.perf_counter() - started
+        self._ready.set()
+
+    @property
+    def ready(self):
+        """True once loading has finished (successfully or not)."""
+        return self._ready.is_set()
+
+    @property
+    def available(self):
+        return self.ready and self.error is None and (self.model is not None or self.remote is not None)
+
+    def pending(self, guids=None):
+        """Number of titles still queued or being translated (only among `guids`, if given)."""
+        with self._lock:
+            if guids is None:
+                return len(self._in_flight)
+            return len(self._in_flight.intersection(guids))
+
+    def submit(self, articles):
+        """Queues untranslated English titles (article dicts with a `guid`) for background translation.
+
+        Returns how many were queued; nothing is queued once loading has failed.
+        """
+        if self.ready and not self.available:
+            return 0
+        with self._lock:
+            todo = [
+                a for a in articles
+                if a["translated_title"] is None and needs_translation(a["title"])
+                and a["guid"] not in self._in_flight and a["guid"] not in self._failed
+            ]
+            self._in_flight.update(a["guid"] for a in todo)
+        if todo:
+            self._executor.submit(self._translate, todo)
+        return len(todo)
+
+    def _translate(self, articles):
+        done = {}
+        transient = False
+        try:
+            if not self.available:
+                return
+            jobs = [dict(a) for a in articles]
+            try:
+                translate_articles(jobs, self.tokenizer, self.model, batch_size=self.batch_size, cache=self.cache,
+                                   remote=self.remote, **self.decode_kwargs)
+            except Exception as e:
+                from translation_server import TranslationRequestRejected
+
+                # Only the shared server raises. Busy or unreachable: these titles are retried on a later render;
+                # a request it rejected outright would fail again, so those titles are given up on like failures
+                transient = not isinstance(e, TranslationRequestRejected)
+                return
+            done = {a["guid"]: a["translated_title"] for a in jobs if a["translated_title"]}
+            if done and self.on_translated:
+                self.on_translated(done)
+        finally:
+            with self._lock:
+                self._in_flight.difference_update(a["guid"] for a in articles)
+                if self.available and not transient:
+                    self._failed.update(a["guid"] for a in articles if a["guid"] not in done)
@@ -0,0 +1,112 @@
+"""Persistent, content-addressed cache for translated titles.
+
+A bounded in-memory LRU sits in front of a SQLite table, so translations
+survive Streamlit reruns, cache clears and process restarts.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import metrics
+
+DEFAULT_MEMORY_ENTRIES = 10000
+
+
+def make_cache_key(text, model_name, decode_settings):
+    """Hashes the source text together with the model and decode settings."""
+    settings = json.dumps(decode_settings, sort_keys=True)
+    payload = "\x1f".join([model_name, settings, text.strip()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """Two-level (memory LRU + SQLite) cache of translations keyed by `make_cache_key`."""
+
+    def __init__(self, path, max_memory_entries=DEFAULT_MEMORY_ENTRIES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY,"
+            " translation TEXT NOT NULL,"
+            " created_at REAL DEFAULT (strftime('%s', 'now')))"
+        )
+        self._conn.commit()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remember(self, key, value):
+        # Caller holds the lock
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def get_many(self, keys):
+        """Returns a dict of the keys that are cached, checking memory before disk."""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+            disk_found = 0
+            # SQLite limits the number of bound parameters, so look keys up in chunks
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, translation in rows:
+                    found[key] = translation
+                    self._remember(key, translation)
+                    disk_found += 1
+            self.disk_hits += disk_found
+            self.misses += len(missing) - disk_found
+        metrics.record_cache("translation", hit=True, amount=len(found))
+        metrics.record_cache("translation", hit=False, amount=len(keys) - len(found))
+        return found
+
+    def set_many(self, items):
+        """Stores `{key: translation}` in memory and on disk."""
+        if not items:
+            return
+        with self._lock:
+            for key, translation in items.items():
+                self._remember(key, translation)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, translation) VALUES (?, ?)",
+                list(items.items()),
+            )
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            disk_entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            return {
+                "memory_entries": len(self._memory),
+                "max_memory_entries": self.max_memory_entries,
+                "disk_entries": disk_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,355 @@
+"""Shared local translation server: one model per machine, batched across sessions and processes.
+
+    python translation_server.py [--port 8502] [--backend int8] [--preset balanced] [--threads 4]
+
+Every Streamlit process and the ingestion worker send titles here (set
+TRANSLATION_SERVER_URL in config.py) instead of loading their own model.
+Requests go into one bounded queue; a single model thread takes up to
+`max_batch_size` titles at a time, waiting at most `max_wait` after the
+oldest queued title for more to arrive, so concurrent single-title requests
+share a `generate` call. When the queue is full new requests get a 503 with
+Retry-After instead of piling up.
+
+    POST /translate  {"texts": [...]} -> {"translations": [...]}
+    GET  /health     readiness, queue depth and batching stats
+    GET  /metrics    Prometheus text (see metrics.py)
+
+`TranslationClient` is the matching client.
+"""
+import argparse
+import collections
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import metrics
+from config import (
+    HTTP_CONNECT_TIMEOUT,
+    TRANSLATION_BACKEND,
+    TRANSLATION_CACHE_MEMORY_ENTRIES,
+    TRANSLATION_CACHE_PATH,
+    TRANSLATION_PRESET,
+    TRANSLATION_SERVER_MAX_BATCH,
+    TRANSLATION_SERVER_MAX_WAIT_MS,
+    TRANSLATION_SERVER_QUEUE_SIZE,
+    TRANSLATION_THREADS,
+)
+
+logger = logging.getLogger("bharatpulse.translation_server")
+
+DEFAULT_PORT = 8502
+MAX_TEXTS_PER_REQUEST = 256
+REQUEST_TIMEOUT = 120 # Seconds a request may wait for its translations before getting a 504
+RETRY_AFTER_SECONDS = 1
+
+
+class QueueFull(Exception):
+    """The server's queue can't take these texts right now; retry later."""
+
+
+class MicroBatcher:
+    """Bounded queue of texts drained by one thread in batches of up to `max_batch_size`.
+
+    A batch is cut as soon as it is full, or `max_wait` seconds after its oldest
+    text was queued. `translate` takes a list of texts and returns one result each;
+    it runs only on the batching thread, after `load` (if given) has finished.
+    """
+
+    def __init__(self, translate, max_batch_size=TRANSLATION_SERVER_MAX_BATCH,
+                 max_wait=TRANSLATION_SERVER_MAX_WAIT_MS / 1000, max_queue=TRANSLATION_SERVER_QUEUE_SIZE, load=None):
+        self.translate = translate
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self._load = load
+        self._pending = collections.deque() # (text, future, queued_at)
+        self._condition = threading.Condition()
+        self.ready = threading.Event()
+        self.error = None
+        self.counters = {"requests": 0, "texts": 0, "batches": 0, "rejected": 0, "failed_batches": 0}
+        self._thread = threading.Thread(target=self._run, daemon=True, name="micro-batcher")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, texts):
+        """Queues `texts` and returns one Future per text. Raises QueueFull instead of going past `max_queue`."""
+        futures = [Future() for _ in texts]
+        now = time.monotonic()
+        with self._condition:
+            if self.error is not None:
+                raise RuntimeError(f"translation model unavailable: {self.error}")
+            if len(self._pending) + len(texts) > self.max_queue:
+                self.counters["rejected"] += 1
+                raise QueueFull(f"{len(self._pending)} texts already queued")
+            self._pending.extend((text, future, now) for text, future in zip(texts, futures))
+            self.counters["requests"] += 1
+            self.counters["texts"] += len(texts)
+            self._condition.notify()
+        return futures
+
+    def _next_batch(self):
+        with self._condition:
+            while not self._pending:
+                self._condition.wait()
+            deadline = self._pending[0][2] + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return [self._pending.popleft() for _ in range(min(self.max_batch_size, len(self._pending)))]
+
+    def _run(self):
+        if self._load is not None:
+            try:
+                self._load()
+            except Exception as e:
+                logger.exception("could not load translation model")
+                with self._condition:
+                    self.error = str(e)
+                    failed, self._pending = list(self._pending), collections.deque()
+                for _, future, _ in failed:
+                    future.set_exception(RuntimeError(f"translation model unavailable: {e}"))
+                self.ready.set()
+                return
+        self.ready.set()
+        while True:
+            batch = self._next_batch()
+            metrics.observe("server_queue_wait", time.monotonic() - batch[0][2])
+            try:
+                results = self.translate([text for text, _, _ in batch])
+            except Exception as e:
+                logger.exception("translation batch failed")
+                with self._condition:
+                    self.counters["failed_batches"] += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            with self._condition:
+                self.counters["batches"] += 1
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self.counters, queued=len(self._pending))
+        stats["mean_batch_size"] = round(stats["texts"] / stats["batches"], 2) if stats["batches"] else 0
+        return stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        batcher = self.server.batcher
+        if self.path == "/health":
+            return self._send_json(200, dict(batcher.stats(), ready=batcher.ready.is_set(), error=batcher.error,
+                                             max_texts=min(MAX_TEXTS_PER_REQUEST, batcher.max_queue)))
+        if self.path == "/metrics":
+            body = metrics.render_prometheus().encode("utf-8")
+            return self._send(200, body, "text/plain; version=0.0.4; charset=utf-8")
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/translate":
+            return self._send_json(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            texts = json.loads(self.rfile.read(length))["texts"]
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                raise ValueError("'texts' must be a list of strings")
+            max_texts = min(MAX_TEXTS_PER_REQUEST, self.server.batcher.max_queue) # More could never be queued
+            if len(texts) > max_texts:
+                raise ValueError(f"at most {max_texts} texts per request")
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send_json(400, {"error": str(e)})
+        try:
+            futures = self.server.batcher.submit(texts)
+        except QueueFull as e:
+            return self._send_json(503, {"error": str(e)}, {"Retry-After": str(RETRY_AFTER_SECONDS)})
+        except RuntimeError as e:
+            return self._send_json(503, {"error": str(e)})
+        deadline = time.monotonic() + REQUEST_TIMEOUT
+        try:
+            translations = [f.result(timeout=max(0, deadline - time.monotonic())) for f in futures]
+        except FutureTimeoutError:
+            return self._send_json(504, {"error": "timed out waiting for the model"})
+        except Exception as e:
+            return self._send_json(500, {"error": str(e)})
+        self._send_json(200, {"translations": translations})
+
+    def _send_json(self, status, payload, headers=None):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                   "application/json; charset=utf-8", headers)
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128 # Many sessions connect at once; the default backlog of 5 resets connections
+
+
+def make_server(batcher, host="127.0.0.1", port=DEFAULT_PORT):
+    """Returns an HTTP server (not yet serving) that feeds `batcher`."""
+    server = _Server((host, port), _Handler)
+    server.batcher = batcher
+    return server
+
+
+class TranslationServerBusy(Exception):
+    """The translation server kept rejecting requests (queue full or model unavailable)."""
+
+
+class TranslationRequestRejected(Exception):
+    """The translation server refused the request itself (HTTP 4xx other than 503); retrying won't help."""
+
+
+class TranslationClient:
+    """Client for translation_server.py; `translate` mirrors the server's POST /translate.
+
+    Long lists are sent in chunks of at most `max_texts` (what the server accepts
+    per request; lowered to the server's own limit from its /health).
+    """
+
+    def __init__(self, url, timeout=(HTTP_CONNECT_TIMEOUT, REQUEST_TIMEOUT + 5), retries=3,
+                 max_texts=min(MAX_TEXTS_PER_REQUEST, TRANSLATION_SERVER_QUEUE_SIZE)):
+        import requests
+
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.max_texts = max_texts
+        self._limits_checked = False
+        self.session = requests.Session()
+
+    def health(self):
+        response = self.session.get(f"{self.url}/health", timeout=self.timeout)
+        response.raise_for_status()
+        health = response.json()
+        if health.get("max_texts"): # Servers started with a smaller --queue-size accept fewer texts per request
+            self.max_texts = min(self.max_texts, health["max_texts"])
+            self._limits_checked = True
+        return health
+
+    def wait_ready(self, timeout=600, poll_seconds=2):
+        """Blocks until the server has loaded its model. Raises if it failed or `timeout` passes."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                health = self.health()
+                if health.get("error"):
+                    raise RuntimeError(f"translation server has no model: {health['error']}")
+                if health.get("ready"):
+                    return health
+            except OSError: # Connection refused while the server is starting (requests' errors are OSErrors)
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"translation server at {self.url} not ready after {timeout}s")
+            time.sleep(poll_seconds)
+
+    def translate(self, texts):
+        """Returns one translation per text, in requests of at most `max_texts` texts.
+
+        A 503 (queue full, model loading) or a connection error is retried,
+        after the server's Retry-After; if it persists TranslationServerBusy is
+        raised. Any other 4xx raises TranslationRequestRejected, which won't
+        succeed on a retry.
+        """
+        texts = list(texts)
+        if len(texts) > 1 and not self._limits_checked:
+            try:
+                self.health()
+            except OSError:
+                pass # Unreachable: _translate_chunk retries and reports it
+        translations = []
+        for start in range(0, len(texts), self.max_texts):
+            translations.extend(self._translate_chunk(texts[start:start + self.max_texts]))
+        return translations
+
+    def _translate_chunk(self, texts):
+        error = "translation server busy"
+        for attempt in range(self.retries + 1):
+            delay = RETRY_AFTER_SECONDS
+            try:
+                response = self.session.post(f"{self.url}/translate", json={"texts": texts}, timeout=self.timeout)
+            except OSError as e: # Refused, reset or timed out (requests' errors are OSErrors)
+                error = str(e)
+            else:
+                if response.status_code == 503:
+                    error = response.json().get("error", error)
+                    delay = float(response.headers.get("Retry-After", RETRY_AFTER_SECONDS))
+                elif 400 <= response.status_code < 500:
+                    raise TranslationRequestRejected(response.json().get("error", response.reason))
+                else:
+                    response.raise_for_status()
+                    return response.json()["translations"]
+            if attempt < self.retries:
+                time.sleep(delay)
+        raise TranslationServerBusy(error)
+
+
+def main():
+    from translation import BACKENDS, DECODING_PRESETS, cache_model_name, load_model, translate_batch
+    from translation_cache import TranslationCache
+
+    parser = argparse.ArgumentParser(description="Serve English -> Telugu translation to every BharatPulse process.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--backend", choices=BACKENDS, default=TRANSLATION_BACKEND)
+    parser.add_argument("--preset", choices=sorted(DECODING_PRESETS), default=TRANSLATION_PRESET)
+    parser.add_argument("--threads", type=int, default=TRANSLATION_THREADS)
+    parser.add_argument("--max-batch", type=int, default=TRANSLATION_SERVER_MAX_BATCH,
+                        help="most titles per generate call (default: %(default)s)")
+    parser.add_argument("--max-wait-ms", type=float, default=TRANSLATION_SERVER_MAX_WAIT_MS,
+                        help="how long a batch waits for more titles (default: %(default)s)")
+    parser.add_argument("--queue-size", type=int, default=TRANSLATION_SERVER_QUEUE_SIZE,
+                        help="queued titles before requests are rejected with 503 (default: %(default)s)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    cache = TranslationCache(TRANSLATION_CACHE_PATH, max_memory_entries=TRANSLATION_CACHE_MEMORY_ENTRIES)
+    decode_kwargs = dict(DECODING_PRESETS[args.preset], model_name=cache_model_name(backend=args.backend))
+    model = {}
+
+    def load():
+        started = time.perf_counter()
+        model["tokenizer"], model["model"] = load_model(backend=args.backend, num_threads=args.threads)
+        logger.info("model loaded in %.1fs (%s backend, %s preset)", time.perf_counter() - started,
+                    args.backend, args.preset)
+
+    def translate(texts):
+        translations, _ = translate_batch(texts, model["tokenizer"], model["model"], batch_size=len(texts),
+                                          cache=cache, **decode_kwargs)
+        return translations
+
+    batcher = MicroBatcher(translate, max_batch_size=args.max_batch, max_wait=args.max_wait_ms / 1000,
+                           max_queue=args.queue_size, load=load).start()
+    metrics.register_collector("translation_server", batcher.stats)
+    metrics.register_collector("translation_cache", cache.stats)
+    server = make_server(batcher, args.host, args.port)
+    logger.info("translation server on http://%s:%d (loading model in the background)", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
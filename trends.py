@@ -0,0 +1,251 @@
+"""Trending terms over recently ingested headlines, in fixed memory.
+
+Each new article's title and summary become a set of terms. These are
+Telugu/English words without stopwords, adjacent word pairs, and gazetteer
+places. A place counts under one name in either script.
+
+Counts go into a count-min sketch per time bucket, and a ring of buckets
+forms the sliding window. Old counts expire by clearing one bucket, with no
+recount. A bounded candidate table keeps the terms with the highest
+estimates (heavy hitters), and these are all `TrendTracker.trending` ranks.
+
+Memory is `buckets x depth x width` counters plus `max_candidates` terms,
+however many articles flow through. The worker loads the tracker from the
+article store, adds each run's new articles and saves it back with the
+current ranking, which is what the app shows.
+"""
+import hashlib
+import io
+import json
+import math
+import re
+import time
+from collections import Counter
+
+import numpy as np
+
+from config import (
+    TRENDS_BUCKET_SECONDS,
+    TRENDS_MAX_CANDIDATES,
+    TRENDS_MIN_COUNT,
+    TRENDS_MIN_SCORE,
+    TRENDS_RECENT_BUCKETS,
+    TRENDS_SKETCH_DEPTH,
+    TRENDS_SKETCH_WIDTH,
+    TRENDS_WINDOW_BUCKETS,
+)
+from feed_parser import html_fields
+from gazetteer import MIN_TERM_LENGTH, resolve, stem, tokenize
+
+STOPWORDS = {
+    "the", "and", "for", "with", "from", "that", "this", "are", "was", "were", "has", "have", "had", "will", "its",
+    "his", "her", "their", "they", "them", "who", "what", "when", "where", "which", "into", "over", "after",
+    "before", "about", "amid", "than", "more", "most", "also", "been", "being", "but", "not", "all", "can", "new",
+    "says", "said", "held", "today", "year", "years", "day", "days", "news", "one", "two", "three", "per", "out",
+    "near", "make", "makes", "under", "against", "via", "set", "get", "gets", "amid", "how", "why", "you", "your",
+    "మరియు", "కోసం", "నుంచి", "నుండి", "వద్ద", "కూడా", "అని", "ఒక", "మంది", "వరకు", "తర్వాత", "ముందు", "లోని",
+    "చేశారు", "చేసిన", "చేయాలని", "అన్నారు", "తెలిపారు", "ఉంది", "ఉన్న", "ఉన్నాయి", "జరిగిన", "సందర్భంగా",
+}
+_CLAUSE_RE = re.compile(r"[.,:;!?|\"'()\[\]\u2013\u2014-]+") # Word pairs don't span these
+SUBSUMED_RATIO = 0.8 # A word is hidden when a shown pair containing it has at least this share of its mentions
+MAX_PLACE_MEMO = 100000 # Bounded memo of word -> place lookups
+
+
+_place_memo = {}
+
+
+def _place(token):
+    """The gazetteer place a word refers to (inflected Telugu forms included), memoized."""
+    if token not in _place_memo:
+        if len(_place_memo) >= MAX_PLACE_MEMO:
+            _place_memo.clear()
+        _place_memo[token] = resolve(token) if len(token) >= MIN_TERM_LENGTH else None
+    return _place_memo[token]
+
+
+def article_terms(article):
+    """Returns {key: label} for the distinct terms of one article's title and summary.
+
+    Keys are normalized (places by their English name, Telugu words stemmed);
+    labels are what the Trending strip shows.
+    """
+    terms = {}
+    for text in (article.get("title"), article.get("summary")):
+        text = html_fields(text)[0] # Older stores kept escaped summaries; "&amp;" must not count as "amp"
+        for clause in _CLAUSE_RE.split(text):
+            previous = None
+            for token in tokenize(clause):
+                if len(token) < MIN_TERM_LENGTH or token in STOPWORDS or token.isdigit():
+                    previous = None
+                    continue
+                place = _place(token)
+                if place:
+                    key, label = "place:" + place["name"], f"{place['telugu']} ({place['name']})"
+                else:
+                    key, label = "word:" + stem(token), token
+                terms.setdefault(key, label)
+                if previous:
+                    terms.setdefault(f"pair:{previous[0]}\t{key}", f"{previous[1]} {token}")
+                previous = (key, token)
+    return terms
+
+
+def _columns(key, width, depth):
+    """Sketch column for `key` in each row, from one hash (double hashing)."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    h1, h2 = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+    return [(h1 + row * h2) % width for row in range(depth)]
+
+
+class TrendTracker:
+    """Sliding-window count-min sketch with a heavy-hitter candidate table.
+
+    Counts are articles mentioning a term (each article counts a term once).
+    `trending` compares the last `recent_buckets` against the rest of the
+    window, so steady terms ("hyderabad" every hour) rank below a sudden
+    burst.
+    """
+
+    def __init__(self, bucket_seconds=TRENDS_BUCKET_SECONDS, window_buckets=TRENDS_WINDOW_BUCKETS,
+                 recent_buckets=TRENDS_RECENT_BUCKETS, width=TRENDS_SKETCH_WIDTH, depth=TRENDS_SKETCH_DEPTH,
+                 max_candidates=TRENDS_MAX_CANDIDATES):
+        self.bucket_seconds = bucket_seconds
+        self.window_buckets = window_buckets
+        self.recent_buckets = min(recent_buckets, window_buckets)
+        self.width = width
+        self.depth = depth
+        self.max_candidates = max_candidates
+        self._rows = np.arange(depth)
+        self._buckets = np.zeros((window_buckets, depth, width), dtype=np.uint32)
+        self._window = np.zeros((depth, width), dtype=np.uint32) # Sum of the live buckets
+        self._bucket_ids = [None] * window_buckets # Bucket number (time // bucket_seconds) held by each slot
+        self._current = None
+        self._candidates = {} # key -> [window estimate, label]
+        self.articles = 0
+
+    def _params(self):
+        return [self.bucket_seconds, self.window_buckets, self.recent_buckets, self.width, self.depth,
+                self.max_candidates]
+
+    def _advance(self, bucket_id):
+        """Moves the window forward to `bucket_id`, clearing the buckets that fall out of it."""
+        if self._current is not None and bucket_id <= self._current:
+            return # Late timestamps count towards the current bucket
+        # A new tracker starts with just the current bucket, so empty history doesn't count as a quiet baseline
+        start = bucket_id if self._current is None else max(self._current + 1, bucket_id - self.window_buckets + 1)
+        for new_id in range(start, bucket_id + 1):
+            slot = new_id % self.window_buckets
+            if self._bucket_ids[slot] is not None:
+                self._window -= self._buckets[slot]
+                self._buckets[slot] = 0
+            self._bucket_ids[slot] = new_id
+        self._current = bucket_id
+        # Candidate estimates only ever drop here, so refresh them and forget terms that left the window
+        for key, entry in list(self._candidates.items()):
+            entry[0] = self._estimate(self._window, key)
+            if entry[0] == 0:
+                del self._candidates[key]
+
+    def _estimate(self, counts, key):
+        return int(counts[self._rows, _columns(key, self.width, self.depth)].min())
+
+    def add(self, articles, now=None):
+        """Counts the terms of new articles at time `now` (default: now)."""
+        now = time.time() if now is None else now
+        self._advance(int(now // self.bucket_seconds))
+        counts = Counter()
+        labels = {}
+        for article in articles:
+            terms = article_terms(article)
+            counts.update(terms.keys())
+            labels.update(terms)
+            self.articles += 1
+        bucket = self._buckets[self._current % self.window_buckets]
+        for key, count in counts.items():
+            columns = _columns(key, self.width, self.depth)
+            bucket[self._rows, columns] += count
+            self._window[self._rows, columns] += count
+            self._offer(key, labels[key], int(self._window[self._rows, columns].min()))
+
+    def _offer(self, key, label, estimate):
+        entry = self._candidates.get(key)
+        if entry is not None:
+            entry[0], entry[1] = estimate, label
+            return
+        if len(self._candidates) < self.max_candidates:
+            self._candidates[key] = [estimate, label]
+            return
+        weakest = min(self._candidates, key=lambda k: self._candidates[k][0])
+        if estimate > self._candidates[weakest][0]:
+            del self._candidates[weakest]
+            self._candidates[key] = [estimate, label]
+
+    def trending(self, limit=10, now=None, min_count=TRENDS_MIN_COUNT, min_score=TRENDS_MIN_SCORE):
+        """Returns up to `limit` dicts (term, recent, window, score), highest burst score first."""
+        now = time.time() if now is None else now
+        self._advance(int(now // self.bucket_seconds))
+        recent_slots = [(self._current - back) % self.window_buckets for back in range(self.recent_buckets)]
+        recent_counts = self._buckets[recent_slots].sum(axis=0)
+        older_buckets = sum(
+            1 for bucket_id in self._bucket_ids
+            if bucket_id is not None and bucket_id <= self._current - self.recent_buckets
+        )
+        rows = []
+        for key, (window, label) in self._candidates.items():
+            recent = min(self._estimate(recent_counts, key), window)
+            if recent < min_count:
+                continue
+            # Expected mentions over the recent buckets at the older buckets' rate (0 without history)
+            expected = (window - recent) / older_buckets * self.recent_buckets if older_buckets else 0.0
+            score = (recent - expected) / math.sqrt(expected + 1)
+            if score >= min_score:
+                rows.append({"key": key, "term": label, "recent": recent, "window": window, "score": round(score, 2)})
+        # On equal scores a pair goes first, so the words inside it can be hidden
+        rows.sort(key=lambda row: (-row["score"], -row["recent"], not row["key"].startswith("pair:"), row["term"]))
+
+        shown = []
+        shown_parts = {} # Word/place key -> highest recent count of a shown pair containing it
+        for row in rows:
+            # "chief" and "minister" (or "minister said") add nothing next to "chief minister"
+            parts = row["key"][5:].split("\t") if row["key"].startswith("pair:") else [row["key"]]
+            if any(shown_parts.get(part, 0) >= SUBSUMED_RATIO * row["recent"] for part in parts):
+                continue
+            if len(parts) == 2:
+                for part in parts:
+                    shown_parts[part] = max(shown_parts.get(part, 0), row["recent"])
+            shown.append(row)
+            if len(shown) == limit:
+                break
+        return [{name: row[name] for name in ("term", "recent", "window", "score")} for row in shown]
+
+    def state(self):
+        """Serializes the tracker (sketches, window position and candidates) to bytes for the store."""
+        meta = {
+            "params": self._params(),
+            "bucket_ids": self._bucket_ids,
+            "current": self._current,
+            "candidates": self._candidates,
+            "articles": self.articles,
+        }
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, buckets=self._buckets, meta=np.frombuffer(json.dumps(meta).encode("utf-8"),
+                                                                                dtype=np.uint8))
+        return buffer.getvalue()
+
+    @classmethod
+    def from_state(cls, data, **kwargs):
+        """Rebuilds a tracker saved with `state`; starts empty if there's none or the settings changed."""
+        tracker = cls(**kwargs)
+        if not data:
+            return tracker
+        with np.load(io.BytesIO(data)) as saved:
+            meta = json.loads(saved["meta"].tobytes().decode("utf-8"))
+            if meta["params"] != tracker._params():
+                return tracker
+            tracker._buckets = saved["buckets"].copy()
+        tracker._window = tracker._buckets.sum(axis=0, dtype=np.uint32)
+        tracker._bucket_ids = meta["bucket_ids"]
+        tracker._current = meta["current"]
+        tracker._candidates = meta["candidates"]
+        tracker.articles = meta["articles"]
+        return tracker
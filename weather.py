@@ -0,0 +1,183 @@
+"""Current-weather lookups shared by every session of the app.
+
+One `WeatherService` per process keeps a bounded LRU of recent cities:
+- Fresh entries are served directly.
+- Stale ones are served at once while a background request refreshes them.
+- Concurrent lookups of the same city share a single in-flight API call.
+- Popular districts can be kept warm with `start_prefetch`.
+
+The API base URL is a parameter, so the service runs just as well against a
+local mock (see benchmarks/fixture_server.py).
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from config import (
+    WEATHER_API_URL,
+    WEATHER_ERROR_SECONDS,
+    WEATHER_FRESH_SECONDS,
+    WEATHER_MAX_CITIES,
+    WEATHER_STALE_SECONDS,
+)
+
+logger = logging.getLogger("bharatpulse.weather")
+
+
+class WeatherError(Exception):
+    """The weather for a city could not be fetched or understood."""
+
+
+def parse_weather(weather_data):
+    """Picks the fields the app shows out of an OpenWeatherMap current-weather response."""
+    main_weather = weather_data['weather'][0]['description'] if weather_data.get('weather') else "N/A"
+    return {
+        "description": main_weather.capitalize(),
+        "temperature": weather_data['main']['temp'],
+        "feels_like": weather_data['main']['feels_like'],
+        "humidity": weather_data['main']['humidity'],
+        "wind_speed": weather_data['wind']['speed'],
+    }
+
+
+class WeatherService:
+    """Coalescing, stale-while-revalidate cache in front of the current-weather API.
+
+    Entries younger than `fresh_seconds` are served as-is; up to `stale_seconds`
+    they are served while being refreshed in the background; older ones (or
+    unknown cities) wait for one shared request. Failed lookups are remembered
+    for `error_seconds` so a bad city name doesn't hit the API on every rerun.
+    """
+
+    def __init__(self, api_key, base_url=WEATHER_API_URL, client=None, fresh_seconds=WEATHER_FRESH_SECONDS,
+                 stale_seconds=WEATHER_STALE_SECONDS, error_seconds=WEATHER_ERROR_SECONDS,
+                 max_entries=WEATHER_MAX_CITIES, max_workers=4):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.client = client
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.error_seconds = error_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # city key -> (info, error message, fetched_at), least recently used first
+        self._in_flight = {} # city key -> Future of the request every caller for that city waits on
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather")
+        self.counters = {
+            "fresh_hits": 0, "stale_hits": 0, "error_hits": 0, "misses": 0,
+            "coalesced": 0, # Lookups that joined a request already in flight
+            "requests": 0, "errors": 0,
+        }
+
+    @staticmethod
+    def _key(city):
+        return " ".join(city.split()).casefold()
+
+    def _count(self, name):
+        # Caller holds the lock
+        self.counters[name] += 1
+
+    def get(self, city):
+        """Returns the weather dict for `city`. Raises WeatherError if it can't be fetched."""
+        key = self._key(city)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                info, error, fetched_at = entry
+                age = now - fetched_at
+                if error is not None and age < self.error_seconds:
+                    self._count("error_hits")
+                    raise WeatherError(error)
+                if info is not None and age < self.fresh_seconds:
+                    self._count("fresh_hits")
+                    metrics.record_cache("weather", hit=True)
+                    return info
+                if info is not None and age < self.stale_seconds:
+                    self._count("stale_hits")
+                    metrics.record_cache("weather", hit=True)
+                    self._refresh(key, city)
+                    return info
+            self._count("misses")
+            metrics.record_cache("weather", hit=False)
+            future = self._refresh(key, city)
+        return future.result()
+
+    def _refresh(self, key, city):
+        # Caller holds the lock; the request is registered before the worker can finish and remove it
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._count("coalesced")
+            return future
+        future = self._executor.submit(self._fetch, key, city)
+        self._in_flight[key] = future
+        return future
+
+    def _fetch(self, key, city):
+        params = {
+            'q': city,
+            'appid': self.api_key,
+            'units': 'metric', # For Celsius
+            'lang': 'te' # Try for Telugu, though not all weather APIs support all languages
+        }
+        from http_client import default_client # Imports requests; deferred so importing this module stays light
+
+        client = self.client or default_client()
+        try:
+            with metrics.timer("weather_request"):
+                info = parse_weather(client.get(self.base_url, params=params).json())
+            error = None
+        except Exception as e:
+            reason = str(e).replace(self.api_key, "***") if self.api_key else str(e) # Request URLs carry the key
+            logger.warning("weather for %s failed: %s", city, reason)
+            info, error = None, f"Error fetching weather for {city}: {reason}"
+        with self._lock:
+            self._count("requests")
+            if error is None:
+                self._store(key, (info, None, time.monotonic()))
+            else:
+                self._count("errors")
+                previous = self._entries.get(key)
+                if previous is None or previous[0] is None: # A stale reading beats an error
+                    self._store(key, (None, error, time.monotonic()))
+            self._in_flight.pop(key, None)
+        if error is not None:
+            raise WeatherError(error)
+        return info
+
+    def _store(self, key, entry):
+        # Caller holds the lock
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def prefetch(self, cities):
+        """Starts background requests for the cities that aren't fresh; returns immediately."""
+        now = time.monotonic()
+        with self._lock:
+            for city in cities:
+                key = self._key(city)
+                entry = self._entries.get(key)
+                if entry is None or entry[0] is None or now - entry[2] >= self.fresh_seconds:
+                    self._refresh(key, city)
+
+    def start_prefetch(self, cities, interval=None):
+        """Keeps `cities` warm from a daemon thread, refreshing them a little before they go stale."""
+        interval = interval or self.fresh_seconds * 0.8
+
+        def loop():
+            while True:
+                self.prefetch(cities)
+                time.sleep(interval)
+
+        threading.Thread(target=loop, daemon=True, name="weather-prefetch").start()
+        return self
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, entries=len(self._entries), in_flight=len(self._in_flight))